@@ -0,0 +1,28 @@
+"""BMAD agent memory layer.
+
+Qdrant-backed long-term memory for BMAD agents: shard storage, semantic
+search, and the pre/post-work hooks that agents call around stories,
+architecture decisions, and bug fixes.
+"""
+
+from .agent_hooks import AgentMemoryHooks
+from .batching import get_batched_store
+from .config import get_memory_config
+from .memory_search import format_for_context, search_memories, search_memories_batch
+from .memory_store import flush_memory, generate_unique_id, store_batch, store_memory
+from .models import MemoryShard, SearchResult
+
+__all__ = [
+    "AgentMemoryHooks",
+    "MemoryShard",
+    "SearchResult",
+    "flush_memory",
+    "format_for_context",
+    "generate_unique_id",
+    "get_batched_store",
+    "get_memory_config",
+    "search_memories",
+    "search_memories_batch",
+    "store_batch",
+    "store_memory",
+]
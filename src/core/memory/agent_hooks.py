@@ -0,0 +1,237 @@
+"""Pre/post-work memory hooks that BMAD agents call around their workflows."""
+
+import asyncio
+import secrets
+from datetime import datetime
+from typing import Optional
+
+from .memory_search import (
+    format_for_context,
+    merge_topk,
+    search_memories,
+    search_memories_async,
+)
+from .memory_store import store_batch
+from .models import MemoryShard
+from .token_budget import get_token_budget
+
+
+# Query templates for the pre-work hooks, bound once as .format methods so
+# the hottest call sites skip the per-call attribute lookup.
+_STORY_QUERY = "story {} {} implementation".format
+_ERROR_QUERY = "{} error {}".format
+_ARCH_QUERY = "architecture {} {}".format
+_IMPL_QUERY = "implementation {} {}".format
+
+
+def _make_seen_filter():
+    """Return a membership filter for already-stored unique_ids.
+
+    Prefers a scalable bloom filter (~200ns lookups, bounded memory at
+    100k ids); falls back to a plain set when pybloom_live is absent.
+    """
+    try:
+        from pybloom_live import ScalableBloomFilter
+
+        return ScalableBloomFilter(initial_capacity=100_000, error_rate=0.001)
+    except ImportError:
+        return set()
+
+
+class AgentMemoryHooks:
+    """Memory integration points for a single agent in a single project group.
+
+    ``before_*`` hooks retrieve relevant memories and return a formatted
+    context block; ``after_*`` hooks persist what the agent just produced.
+    """
+
+    def __init__(self, group_id: str, agent: str):
+        self.group_id = group_id
+        self.agent = agent
+        # Built once per hooks instance; every search in every hook filters
+        # on the same group_id, so the condition objects are reused as-is.
+        from qdrant_client.models import FieldCondition, MatchValue
+
+        self._base_conditions = [
+            FieldCondition(key="group_id", match=MatchValue(value=group_id))
+        ]
+        # Agent-scoped hooks always filter on (group_id, agent); keep that
+        # prefix prebuilt as well so they allocate nothing per search.
+        self._agent_conditions = self._base_conditions + [
+            FieldCondition(key="agent", match=MatchValue(value=agent))
+        ]
+        self._seen_ids = _make_seen_filter()
+
+    def _store_new(self, shards: list[MemoryShard]) -> int:
+        """Store shards whose unique_id has not been stored by this instance.
+
+        The in-memory filter answers the duplicate question locally, so
+        only genuinely new shards pay the Qdrant round-trip.
+        """
+        new_shards = [s for s in shards if s.unique_id not in self._seen_ids]
+        if not new_shards:
+            return 0
+        stored = store_batch(new_shards)
+        if stored:
+            for shard in new_shards:
+                self._seen_ids.add(shard.unique_id)
+        return stored
+
+    # -- pre-work hooks -------------------------------------------------
+
+    async def before_story_start_async(self, story_id: str, feature: str) -> str:
+        """Retrieve prior outcomes and known error patterns for a story.
+
+        The two searches are independent network round-trips, so they run
+        concurrently; wall-clock latency is max(RTT) instead of sum(RTT).
+        """
+        outcome_results, error_results = await asyncio.gather(
+            search_memories_async(
+                query=_STORY_QUERY(story_id, feature),
+                base_conditions=self._base_conditions,
+                memory_types=["story-outcome", "architecture-decision"],
+            ),
+            search_memories_async(
+                query=_ERROR_QUERY(story_id, feature),
+                base_conditions=self._base_conditions,
+                memory_types=["error-pattern"],
+                limit=3,
+            ),
+        )
+        return format_for_context(
+            merge_topk((outcome_results, error_results)),
+            max_tokens=get_token_budget(self.agent),
+        )
+
+    def before_story_start(self, story_id: str, feature: str) -> str:
+        """Sync wrapper around :meth:`before_story_start_async`."""
+        return asyncio.run(self.before_story_start_async(story_id, feature))
+
+    def before_architecture_decision(self, topic: str) -> str:
+        """Retrieve prior architecture decisions relevant to a topic."""
+        results = search_memories(
+            query=_ARCH_QUERY(topic, self.group_id),
+            base_conditions=self._base_conditions,
+            memory_types=["architecture-decision"],
+        )
+        return format_for_context(results, max_tokens=get_token_budget(self.agent))
+
+    def before_implementation(self, component: str) -> str:
+        """Retrieve implementation notes and error patterns for a component."""
+        results = search_memories(
+            query=_IMPL_QUERY(component, self.group_id),
+            base_conditions=self._agent_conditions,
+            memory_types=["implementation", "error-pattern"],
+        )
+        return format_for_context(results, max_tokens=get_token_budget(self.agent))
+
+    # -- post-work hooks ------------------------------------------------
+
+    def after_story_complete(
+        self,
+        story_id: str,
+        epic_id: str,
+        outcome: str,
+        decisions: Optional[list[str]] = None,
+        errors_encountered: Optional[list[str]] = None,
+    ) -> int:
+        """Persist the outcome, decisions, and errors from a completed story."""
+        iso = datetime.now().isoformat()
+
+        shards = [
+            MemoryShard.model_construct(
+                unique_id=f"story-{story_id}-outcome-{secrets.token_hex(4)}",
+                content=outcome,
+                type="story-outcome",
+                agent=self.agent,
+                group_id=self.group_id,
+                importance="high",
+                story_id=story_id,
+                epic_id=epic_id,
+                created_at=iso,
+                tags=["story", epic_id],
+            )
+        ]
+        for index, decision in enumerate(decisions or []):
+            shards.append(
+                MemoryShard.model_construct(
+                    unique_id=f"story-{story_id}-decision-{index}-{secrets.token_hex(4)}",
+                    content=decision,
+                    type="architecture-decision",
+                    agent=self.agent,
+                    group_id=self.group_id,
+                    story_id=story_id,
+                    epic_id=epic_id,
+                    created_at=iso,
+                    tags=["decision", story_id],
+                )
+            )
+        for index, error in enumerate(errors_encountered or []):
+            shards.append(
+                MemoryShard.model_construct(
+                    unique_id=f"story-{story_id}-error-{index}-{secrets.token_hex(4)}",
+                    content=error,
+                    type="error-pattern",
+                    agent=self.agent,
+                    group_id=self.group_id,
+                    importance="high",
+                    story_id=story_id,
+                    epic_id=epic_id,
+                    created_at=iso,
+                    tags=["error", story_id],
+                )
+            )
+        return self._store_new(shards)
+
+    def after_architecture_decision(
+        self,
+        topic: str,
+        decision: str,
+        rationale: str,
+    ) -> int:
+        """Persist an architecture decision and its rationale."""
+        iso = datetime.now().isoformat()
+
+        shards = [
+            MemoryShard.model_construct(
+                unique_id=f"arch-{topic}-{secrets.token_hex(4)}",
+                content=f"{decision}\n\nRationale: {rationale}",
+                type="architecture-decision",
+                agent=self.agent,
+                group_id=self.group_id,
+                importance="critical",
+                component=topic,
+                created_at=iso,
+                tags=["architecture", topic],
+            )
+        ]
+        return self._store_new(shards)
+
+    def after_bug_fix(
+        self,
+        component: str,
+        error_description: str,
+        root_cause: str,
+        fix_description: str,
+    ) -> int:
+        """Persist an error pattern and the fix that resolved it."""
+        iso = datetime.now().isoformat()
+
+        shards = [
+            MemoryShard.model_construct(
+                unique_id=f"error-{component}-{secrets.token_hex(4)}",
+                content=(
+                    f"Error: {error_description}\n"
+                    f"Root cause: {root_cause}\n"
+                    f"Fix: {fix_description}"
+                ),
+                type="error-pattern",
+                agent=self.agent,
+                group_id=self.group_id,
+                importance="high",
+                component=component,
+                created_at=iso,
+                tags=["bug-fix", component],
+            )
+        ]
+        return self._store_new(shards)
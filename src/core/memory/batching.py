@@ -0,0 +1,63 @@
+"""Bounded write buffer that batches memory stores across hook events.
+
+Per-event hooks otherwise pay one Qdrant round-trip per shard. The buffer
+appends locally and flushes one batched upsert per collection when a size
+threshold is reached or the process exits, cutting round-trips roughly by
+the batch size.
+"""
+
+import atexit
+import threading
+from typing import Optional
+
+from .memory_store import store_batch
+from .models import MemoryShard
+
+_FLUSH_THRESHOLD = 16
+
+
+class BatchedStore:
+    """Append buffer flushed at a size threshold and at process exit."""
+
+    def __init__(self, threshold: int = _FLUSH_THRESHOLD):
+        self._threshold = threshold
+        self._lock = threading.Lock()
+        self._pending: dict[str, list[MemoryShard]] = {}
+
+    def add(self, shard: MemoryShard, collection_type: str = "memory") -> None:
+        """Queue a shard; triggers a flush when its bucket fills up."""
+        with self._lock:
+            bucket = self._pending.setdefault(collection_type, [])
+            bucket.append(shard)
+            full = len(bucket) >= self._threshold
+        if full:
+            self.flush(collection_type)
+
+    def flush(self, collection_type: Optional[str] = None) -> int:
+        """Write pending shards now; returns the number stored."""
+        with self._lock:
+            if collection_type is None:
+                drained = self._pending
+                self._pending = {}
+            else:
+                drained = {collection_type: self._pending.pop(collection_type, [])}
+        stored = 0
+        for bucket_type, shards in drained.items():
+            if shards:
+                stored += store_batch(shards, collection_type=bucket_type)
+        return stored
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_batched_store() -> BatchedStore:
+    """Process-wide buffer; registers its exit flush on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = BatchedStore()
+                atexit.register(_store.flush)
+    return _store
@@ -0,0 +1,51 @@
+"""Environment-driven configuration for the BMAD agent memory layer."""
+
+import functools
+import os
+
+# Logical collection type -> Qdrant collection name, resolved once at
+# module load (env is static per process; no reason to re-read it on
+# every store/search call).
+COLLECTION_MAP = {
+    "memory": os.getenv("QDRANT_MEMORY_COLLECTION", "bmad-memory"),
+    "best-practices": os.getenv("QDRANT_BEST_PRACTICES_COLLECTION", "bmad-best-practices"),
+    "knowledge": os.getenv("QDRANT_KNOWLEDGE_COLLECTION", "bmad-knowledge"),
+}
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+@functools.lru_cache(maxsize=4)
+def get_memory_config(collection_type: str = "memory") -> dict:
+    """Return the memory-layer configuration for a collection type.
+
+    All settings come from the environment with sensible local defaults,
+    so hooks work out of the box against a local Qdrant instance. The
+    environment is static for the life of a hook process, so the config
+    is cached per collection type; callers must treat it as read-only.
+    """
+    # BMAD_MEMORY_COLLECTION only renames the memory collection; the
+    # other types have their own QDRANT_*_COLLECTION vars, and letting
+    # it override every type would silently redirect best-practice and
+    # knowledge traffic into the memory collection.
+    collection_name = COLLECTION_MAP.get(collection_type, collection_type)
+    if collection_type == "memory":
+        collection_name = os.getenv("BMAD_MEMORY_COLLECTION", collection_name)
+    return {
+        "url": os.getenv("QDRANT_URL", "http://localhost:6333"),
+        "api_key": os.getenv("QDRANT_API_KEY", ""),
+        "collection_name": collection_name,
+        "embedding_model": os.getenv("BMAD_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL),
+        "vector_size": int(os.getenv("BMAD_MEMORY_VECTOR_SIZE", "384")),
+        "timeout": float(os.getenv("BMAD_MEMORY_TIMEOUT", "5.0")),
+        # gRPC by default: HTTP/2 multiplexing plus keep-alive amortize
+        # connection setup across a workflow's calls. Set to "0" to force
+        # REST against servers without the gRPC port exposed.
+        "prefer_grpc": os.getenv("QDRANT_PREFER_GRPC", "1") == "1",
+        "grpc_port": int(os.getenv("QDRANT_GRPC_PORT", "6334")),
+    }
+
+
+def clear_memory_config_cache() -> None:
+    """Drop cached configs (for tests that monkeypatch the environment)."""
+    get_memory_config.cache_clear()
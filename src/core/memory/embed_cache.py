@@ -0,0 +1,151 @@
+"""Embedding caches: in-process semantic query cache and on-disk content cache."""
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+
+class DiskEmbeddingCache:
+    """Persistent content-hash -> embedding cache backed by SQLite.
+
+    Hook reruns and retries re-store identical content; the encode is the
+    expensive step, so repeated invocations read the vector back as raw
+    float32 bytes instead. WAL + synchronous=NORMAL keeps writes off the
+    hot path's critical section.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        path = path or Path.home() / ".cache" / "bmad" / "embed.sqlite"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (hash BLOB PRIMARY KEY, vector BLOB)"
+        )
+
+    @staticmethod
+    def _key(content: str) -> bytes:
+        return hashlib.blake2b(content.encode(), digest_size=16).digest()
+
+    def get(self, content: str) -> Optional[np.ndarray]:
+        row = self._conn.execute(
+            "SELECT vector FROM embeddings WHERE hash = ?", (self._key(content),)
+        ).fetchone()
+        if row is None:
+            return None
+        return np.frombuffer(row[0], dtype=np.float32)
+
+    def put(self, content: str, vector: np.ndarray) -> None:
+        blob = np.asarray(vector, dtype=np.float32).tobytes()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO embeddings (hash, vector) VALUES (?, ?)",
+            (self._key(content), blob),
+        )
+        self._conn.commit()
+
+
+class QueryEmbeddingCache:
+    """Fixed-capacity semantic cache keyed by int8-quantized embeddings.
+
+    Entries are stored structure-of-arrays style: one contiguous int8
+    matrix of quantized vectors plus a float32 scale per vector, so a
+    lookup is a single SIMD-friendly integer matmul over the whole cache
+    (4x less memory bandwidth than float32 rows). Embeddings are assumed
+    to be unit-norm, so the rescaled dot product approximates cosine
+    similarity.
+    """
+
+    def __init__(
+        self,
+        dim: int = 384,
+        capacity: int = 1024,
+        threshold: float = 0.95,
+        ttl_seconds: float = 600.0,
+    ):
+        self.threshold = threshold
+        self._ttl = ttl_seconds
+        self._vectors = np.zeros((capacity, dim), dtype=np.int8)
+        self._scales = np.zeros(capacity, dtype=np.float32)
+        self._stamps = np.zeros(capacity, dtype=np.float64)
+        self._keys: list[Any] = [None] * capacity
+        self._values: list[Any] = [None] * capacity
+        self._size = 0
+        self._cursor = 0
+
+    @staticmethod
+    def _quantize(vector: np.ndarray):
+        scale = float(np.max(np.abs(vector))) / 127.0
+        if scale == 0.0:
+            scale = 1.0
+        quantized = np.round(vector / scale).astype(np.int8)
+        return quantized, scale
+
+    def get(self, vector: np.ndarray, key: Any) -> Optional[Any]:
+        """Return the cached value for the nearest embedding, or None.
+
+        Only entries stored under the same ``key`` (filter/collection
+        signature) that are younger than the TTL are eligible, and the
+        best match must clear the similarity threshold.
+        """
+        if self._size == 0:
+            return None
+        now = time.monotonic()
+        quantized, scale = self._quantize(vector)
+        # int32 accumulation: numpy accumulates in the operand dtype, and
+        # a 384-term int8 dot product reaches ~7e5 — far past the int16
+        # ceiling, where wrapped sums can spuriously clear the threshold.
+        sims = (
+            self._vectors[: self._size].astype(np.int32) @ quantized.astype(np.int32)
+        ) * (self._scales[: self._size] * scale)
+        eligible = np.fromiter(
+            (
+                self._keys[i] == key and now - self._stamps[i] <= self._ttl
+                for i in range(self._size)
+            ),
+            dtype=bool,
+            count=self._size,
+        )
+        if not eligible.any():
+            return None
+        sims = np.where(eligible, sims, -np.inf)
+        best = int(np.argmax(sims))
+        if sims[best] < self.threshold:
+            return None
+        return self._values[best]
+
+    def put(self, vector: np.ndarray, key: Any, value: Any) -> None:
+        """Insert an entry, evicting the oldest once capacity is reached."""
+        quantized, scale = self._quantize(vector)
+        index = self._cursor
+        self._vectors[index] = quantized
+        self._scales[index] = scale
+        self._stamps[index] = time.monotonic()
+        self._keys[index] = key
+        self._values[index] = value
+        self._cursor = (index + 1) % self._vectors.shape[0]
+        self._size = min(self._size + 1, self._vectors.shape[0])
+
+    def invalidate(self, predicate: Callable[[Any], bool]) -> None:
+        """Evict entries whose key satisfies ``predicate``.
+
+        Slots are blanked in place (a None key matches nothing in
+        ``get``); the vector rows are left as-is and recycled by the
+        ring cursor.
+        """
+        for i in range(self._size):
+            if self._keys[i] is not None and predicate(self._keys[i]):
+                self._keys[i] = None
+                self._values[i] = None
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        capacity = self._vectors.shape[0]
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._size = 0
+        self._cursor = 0
@@ -0,0 +1,194 @@
+"""Persistent Unix-socket embedding daemon and its in-process client.
+
+Short-lived CLI hooks pay the full SentenceTransformer cold start (seconds)
+on every invocation. The daemon keeps the model resident behind a Unix
+socket; hooks become thin clients that send text and receive vectors in
+milliseconds. Concurrent requests are coalesced into a single
+``model.encode`` call (dynamic micro-batching).
+
+Protocol: length-prefixed JSON. Request ``{"texts": [...]}``; reply
+``{"vectors": [[...], ...]}`` or ``{"error": "..."}``.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import struct
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SOCKET_PATH = os.getenv("BMAD_EMBED_SOCKET", "/tmp/bmad-embed.sock")
+_HEADER = struct.Struct(">I")
+_MAX_COALESCE = 64
+
+
+def _send_msg(sock: socket.socket, payload: dict) -> None:
+    body = json.dumps(payload).encode()
+    sock.sendall(_HEADER.pack(len(body)) + body)
+
+
+def _recv_exact(sock: socket.socket, count: int) -> bytes:
+    chunks = []
+    while count:
+        chunk = sock.recv(count)
+        if not chunk:
+            raise ConnectionError("embed daemon closed the connection")
+        chunks.append(chunk)
+        count -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv_msg(sock: socket.socket) -> dict:
+    (length,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return json.loads(_recv_exact(sock, length))
+
+
+def _spawn_daemon() -> None:
+    subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve())],
+        start_new_session=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+class SocketEmbedder:
+    """`.encode`-compatible client that proxies to the embedding daemon.
+
+    Self-starts the daemon on first use if nothing is listening on the
+    socket yet.
+    """
+
+    def __init__(self, path: str = SOCKET_PATH):
+        self._path = path
+
+    def encode(self, text: str, convert_to_numpy: bool = True):
+        return self.encode_batch([text])[0]
+
+    def encode_batch(self, texts: list[str]):
+        import numpy as np
+
+        sock = self._connect()
+        try:
+            _send_msg(sock, {"texts": texts})
+            reply = _recv_msg(sock)
+        finally:
+            sock.close()
+        if "error" in reply:
+            raise RuntimeError(f"embed daemon error: {reply['error']}")
+        return np.asarray(reply["vectors"], dtype=np.float32)
+
+    def _connect(self) -> socket.socket:
+        deadline = time.monotonic() + 30.0
+        spawned = False
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self._path)
+                return sock
+            except OSError:
+                sock.close()
+                if not spawned:
+                    _spawn_daemon()
+                    spawned = True
+                if time.monotonic() > deadline:
+                    raise TimeoutError("embed daemon did not come up in 30s")
+                time.sleep(0.2)
+
+
+def _optimize_model(model, torch):
+    """Lower precision and compile the forward where the hardware allows.
+
+    fp16 on GPU and bf16 on CPUs that support it halve the bytes moved per
+    forward pass; torch.compile removes framework overhead on the fixed
+    MiniLM graph. Anything that fails leaves the fp32 eager model in place.
+    """
+    try:
+        if torch.cuda.is_available():
+            model = model.half().to("cuda")
+        elif getattr(torch.cpu, "_is_cpu_support_bfloat16", lambda: False)():
+            model = model.to(torch.bfloat16)
+    except Exception:
+        pass
+    try:
+        model.encode = torch.compile(model.encode, mode="reduce-overhead")
+    except Exception:
+        pass
+    try:
+        # Warm up so the compiled graph is cached at the hot batch shape
+        # before the first real request arrives.
+        model.encode(["warmup"] * 32)
+    except Exception:
+        pass
+    return model
+
+
+async def _serve() -> None:
+    from sentence_transformers import SentenceTransformer
+
+    # Inference-only process: pin the intra-op pool and keep autograd off.
+    torch = None
+    try:
+        import torch
+
+        torch.set_num_threads(int(os.getenv("BMAD_EMBED_THREADS", str(os.cpu_count() or 4))))
+        torch.set_grad_enabled(False)
+    except ImportError:
+        pass
+
+    model = SentenceTransformer(
+        os.getenv("BMAD_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+    )
+    if torch is not None:
+        model = _optimize_model(model, torch)
+    queue: asyncio.Queue = asyncio.Queue()
+    loop = asyncio.get_running_loop()
+
+    async def batcher() -> None:
+        while True:
+            batch = [await queue.get()]
+            # Coalesce whatever queued up during the last encode into one
+            # forward pass.
+            while not queue.empty() and len(batch) < _MAX_COALESCE:
+                batch.append(queue.get_nowait())
+            texts = [text for req_texts, _ in batch for text in req_texts]
+            try:
+                vectors = await loop.run_in_executor(None, model.encode, texts)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            offset = 0
+            for req_texts, future in batch:
+                if not future.done():
+                    future.set_result(vectors[offset : offset + len(req_texts)])
+                offset += len(req_texts)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            (length,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+            request = json.loads(await reader.readexactly(length))
+            future = loop.create_future()
+            await queue.put((request.get("texts", []), future))
+            vectors = await future
+            body = json.dumps({"vectors": vectors.tolist()}).encode()
+        except Exception as exc:
+            body = json.dumps({"error": str(exc)}).encode()
+        writer.write(_HEADER.pack(len(body)) + body)
+        await writer.drain()
+        writer.close()
+
+    if os.path.exists(SOCKET_PATH):
+        os.unlink(SOCKET_PATH)
+    server = await asyncio.start_unix_server(handle, path=SOCKET_PATH)
+    asyncio.ensure_future(batcher())
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(_serve())
@@ -0,0 +1,54 @@
+"""Short content hashes and date stamps used to mint memory unique_ids."""
+
+import hashlib
+import time
+
+try:
+    # Skip hashlib's constructor registry; openssl_sha256 dispatches to the
+    # SHA-NI / ARMv8-SHA2 code paths in OpenSSL directly.
+    from _hashlib import openssl_sha256 as _sha256
+except ImportError:
+    _sha256 = hashlib.sha256
+
+try:
+    # The ids need uniqueness, not cryptographic strength — a 12-16 hex
+    # char truncation discards SHA-256's security properties anyway, and
+    # xxh3 is several times faster on short inputs.
+    from xxhash import xxh3_128 as _fast_digest
+except ImportError:
+    _fast_digest = None
+
+# The ids only keep 12-16 hex chars of the digest, so hashing the first
+# 4 KiB is just as collision-resistant for this dataset and caps the bytes
+# moved when the input is a multi-KB captured stderr buffer.
+_MAX_HASH_BYTES = 4096
+
+
+def fast_short_hash(data, n: int = 12) -> str:
+    """First ``n`` hex chars of a short hash over at most the first 4 KiB.
+
+    Uses xxh3 when available and SHA-256 otherwise; existing ids minted
+    under one scheme simply coexist with new ones, since ids are opaque.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    view = memoryview(data)[:_MAX_HASH_BYTES]
+    if _fast_digest is not None:
+        return _fast_digest(view).hexdigest()[:n]
+    return _sha256(view).hexdigest()[:n]
+
+
+# id timestamps are day-granular, so the formatted stamp is cached per
+# format and only recomputed when the UTC day number rolls over — no
+# datetime object construction on the id hot path.
+_day_cache: dict = {}
+
+
+def day_stamp(fmt: str = "%Y-%m-%d") -> str:
+    """Current UTC date formatted with ``fmt``, cached until midnight."""
+    day = int(time.time() // 86400)
+    cached = _day_cache.get(fmt)
+    if cached is None or cached[0] != day:
+        cached = (day, time.strftime(fmt, time.gmtime()))
+        _day_cache[fmt] = cached
+    return cached[1]
@@ -0,0 +1,245 @@
+"""Local FAISS mirror of Qdrant collections for sub-millisecond hook lookups.
+
+PreToolUse hooks run on every Edit/Write; a remote ANN query is 50-200ms
+of blocking latency on that path. The mirror scrolls the configured
+collections into an HNSW index persisted under ``~/.cache/bmad`` and
+answers top-k queries in-process, refreshing from Qdrant on a background
+timer.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .config import get_memory_config
+from .memory_store import get_client
+
+_CACHE_DIR = Path.home() / ".cache" / "bmad"
+_REFRESH_SECONDS = 600
+_SCROLL_PAGE = 1024
+
+# Above this size the mirror switches from flat float32 storage (1.5KB per
+# vector resident) to 8-bit product quantization (48 bytes per vector);
+# full-precision vectors stay on disk and are touched only for re-ranking.
+_PQ_MIN_TRAIN = 10_000
+_PQ_SUBQUANTIZERS = 48
+_RERANK_DEPTH = 50
+
+
+def available() -> bool:
+    """True when the optional faiss dependency is importable."""
+    try:
+        import faiss  # noqa: F401
+
+        return True
+    except ImportError:
+        return False
+
+
+class LocalAnnMirror:
+    """HNSW mirror of one or more Qdrant collections."""
+
+    def __init__(
+        self,
+        collection_types: tuple[str, ...] = ("best-practices", "knowledge"),
+        dim: int = 384,
+    ):
+        import faiss
+
+        self._faiss = faiss
+        self._collection_types = collection_types
+        self._dim = dim
+        self._lock = threading.Lock()
+        self._index = None
+        self._labels: list[str] = []
+        self._payloads: list[dict] = []
+        self._vectors = None  # memory-mapped float32 matrix for re-ranking
+        self._index_path = _CACHE_DIR / "bp.faiss"
+        self._meta_path = _CACHE_DIR / "bp.sqlite"
+        self._vectors_path = _CACHE_DIR / "bp_vecs.npy"
+        if not self._load_from_disk():
+            self.refresh()
+        self._start_refresh_timer()
+
+    # -- build / persistence -------------------------------------------
+
+    def refresh(self) -> None:
+        """Re-scroll Qdrant and rebuild the local index."""
+        vectors, labels, payloads = [], [], []
+        client = get_client()
+        for collection_type in self._collection_types:
+            config = get_memory_config(collection_type)
+            offset = None
+            while True:
+                points, offset = client.scroll(
+                    collection_name=config["collection_name"],
+                    limit=_SCROLL_PAGE,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=True,
+                )
+                for point in points:
+                    vectors.append(point.vector)
+                    labels.append(collection_type)
+                    payloads.append(point.payload or {})
+                if offset is None:
+                    break
+
+        matrix = (
+            np.asarray(vectors, dtype=np.float32)
+            if vectors
+            else np.empty((0, self._dim), dtype=np.float32)
+        )
+        index = self._build_index(matrix)
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        np.save(self._vectors_path, matrix)
+        with self._lock:
+            self._index = index
+            self._labels = labels
+            self._payloads = payloads
+            self._vectors = np.load(self._vectors_path, mmap_mode="r")
+        self._save_to_disk()
+
+    def _build_index(self, matrix: np.ndarray):
+        """Flat HNSW for small mirrors, HNSW over PQ codes for large ones."""
+        if matrix.shape[0] < _PQ_MIN_TRAIN:
+            index = self._faiss.IndexHNSWFlat(self._dim, 32)
+            index.hnsw.efSearch = 64
+        else:
+            index = self._faiss.IndexHNSWPQ(self._dim, _PQ_SUBQUANTIZERS, 32)
+            # Wider beam compensates for quantization error; the final
+            # ranking comes from the full-precision re-rank anyway.
+            index.hnsw.efSearch = 128
+            rng = np.random.default_rng(0)
+            sample = matrix[rng.choice(matrix.shape[0], _PQ_MIN_TRAIN, replace=False)]
+            index.train(sample)
+        if matrix.shape[0]:
+            index.add(matrix)
+        return index
+
+    def _save_to_disk(self) -> None:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        self._faiss.write_index(self._index, str(self._index_path))
+        conn = sqlite3.connect(str(self._meta_path))
+        try:
+            conn.execute("DROP TABLE IF EXISTS rows")
+            conn.execute("CREATE TABLE rows (pos INTEGER PRIMARY KEY, label TEXT, payload TEXT)")
+            conn.executemany(
+                "INSERT INTO rows VALUES (?, ?, ?)",
+                (
+                    (pos, self._labels[pos], json.dumps(self._payloads[pos]))
+                    for pos in range(len(self._labels))
+                ),
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('refreshed_at', ?)", (str(time.time()),)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _load_from_disk(self) -> bool:
+        if not (
+            self._index_path.exists()
+            and self._meta_path.exists()
+            and self._vectors_path.exists()
+        ):
+            return False
+        try:
+            conn = sqlite3.connect(str(self._meta_path))
+            try:
+                row = conn.execute(
+                    "SELECT value FROM meta WHERE key = 'refreshed_at'"
+                ).fetchone()
+                if row is None or time.time() - float(row[0]) > _REFRESH_SECONDS:
+                    return False
+                rows = conn.execute("SELECT label, payload FROM rows ORDER BY pos").fetchall()
+            finally:
+                conn.close()
+            index = self._faiss.read_index(str(self._index_path))
+            vectors = np.load(self._vectors_path, mmap_mode="r")
+        except Exception:
+            return False
+        with self._lock:
+            self._index = index
+            self._labels = [label for label, _ in rows]
+            self._payloads = [json.loads(payload) for _, payload in rows]
+            self._vectors = vectors
+        return True
+
+    def _start_refresh_timer(self) -> None:
+        def loop() -> None:
+            while True:
+                time.sleep(_REFRESH_SECONDS)
+                try:
+                    self.refresh()
+                except Exception:
+                    pass  # keep serving the stale mirror
+
+        threading.Thread(target=loop, daemon=True).start()
+
+    # -- queries --------------------------------------------------------
+
+    def query(
+        self,
+        vector: np.ndarray,
+        k: int = 3,
+        collection_type: Optional[str] = None,
+        min_score: float = 0.0,
+    ) -> list[dict]:
+        """Top-k payloads for a query vector, optionally per collection."""
+        with self._lock:
+            index, labels, payloads = self._index, self._labels, self._payloads
+            vectors = self._vectors
+        if index is None or index.ntotal == 0:
+            return []
+        query = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        quantized = isinstance(index, self._faiss.IndexHNSWPQ)
+        # Over-fetch so a collection filter still leaves k candidates; the
+        # PQ index over-fetches further to feed the full-precision re-rank.
+        fetch = k * 4 if collection_type else k
+        if quantized:
+            fetch = max(fetch, _RERANK_DEPTH)
+        distances, ids = index.search(query, min(fetch, index.ntotal))
+        candidates = []
+        for distance, row_id in zip(distances[0], ids[0]):
+            if row_id < 0:
+                continue
+            if collection_type and labels[row_id] != collection_type:
+                continue
+            if quantized and vectors is not None:
+                # Exact cosine from the memory-mapped float32 row; only
+                # the candidate rows are ever paged in.
+                score = float(np.dot(vectors[row_id], query[0]))
+            else:
+                # HNSWFlat returns squared L2; unit vectors map it to cosine.
+                score = 1.0 - float(distance) / 2.0
+            if score < min_score:
+                continue
+            candidates.append((score, row_id))
+        candidates.sort(key=lambda pair: pair[0], reverse=True)
+        return [{"score": score, **payloads[row_id]} for score, row_id in candidates[:k]]
+
+
+_mirror = None
+_mirror_lock = threading.Lock()
+
+
+def get_mirror() -> Optional[LocalAnnMirror]:
+    """Shared mirror instance, or None when faiss is not installed."""
+    global _mirror
+    if _mirror is None:
+        if not available():
+            return None
+        with _mirror_lock:
+            if _mirror is None:
+                _mirror = LocalAnnMirror()
+    return _mirror
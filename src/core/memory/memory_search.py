@@ -0,0 +1,353 @@
+"""Read path for the agent memory layer: semantic search + context formatting."""
+
+import asyncio
+import io
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from .config import get_memory_config
+from .embed_cache import QueryEmbeddingCache
+from .memory_store import get_async_client, get_client, get_embedding_model
+from .models import SearchResult
+from .topk_numba import topk
+
+# Semantic cache for repeat/near-repeat queries within a process. Int8
+# quantization keeps 1024 cached query vectors in ~400KB.
+_query_cache = QueryEmbeddingCache()
+
+# First tier in front of the semantic cache: exact query strings (the hook
+# queries are deterministic per file extension) hit here before the
+# embedding forward pass even runs. TTL-bounded and invalidated on writes.
+_EXACT_CAPACITY = 512
+_EXACT_TTL_SECONDS = 600.0
+_exact_cache: OrderedDict = OrderedDict()
+
+
+def _exact_get(key):
+    entry = _exact_cache.get(key)
+    if entry is None:
+        return None
+    stamp, results = entry
+    if time.monotonic() - stamp > _EXACT_TTL_SECONDS:
+        del _exact_cache[key]
+        return None
+    _exact_cache.move_to_end(key)
+    return results
+
+
+def _exact_put(key, results) -> None:
+    _exact_cache[key] = (time.monotonic(), results)
+    _exact_cache.move_to_end(key)
+    if len(_exact_cache) > _EXACT_CAPACITY:
+        _exact_cache.popitem(last=False)
+
+
+def invalidate_search_cache(collection_type: Optional[str] = None) -> None:
+    """Drop cached search results after a write.
+
+    Covers both tiers — the exact-string cache and the semantic query
+    cache. With a collection_type only that collection's entries are
+    evicted; without one both tiers are cleared.
+    """
+    if collection_type is None:
+        _exact_cache.clear()
+        _query_cache.clear()
+        return
+    stale = [key for key in _exact_cache if key[1] == collection_type]
+    for key in stale:
+        del _exact_cache[key]
+    # Semantic-tier keys start with the collection type (see _cache_key).
+    _query_cache.invalidate(lambda key: key[0] == collection_type)
+
+_qdrant_models = None
+
+
+def _get_qdrant_models():
+    """Resolve qdrant model classes once, keeping module import lazy.
+
+    The function-body import form re-entered the import machinery on
+    every search; this sentinel costs one global read after first use.
+    """
+    global _qdrant_models
+    if _qdrant_models is None:
+        from qdrant_client.models import FieldCondition, Filter, MatchAny, MatchValue
+
+        _qdrant_models = (FieldCondition, Filter, MatchAny, MatchValue)
+    return _qdrant_models
+
+
+def _cache_key(
+    collection_type,
+    group_id,
+    agent,
+    memory_types,
+    story_id,
+    limit,
+    score_threshold,
+    base_conditions,
+):
+    """Hashable signature of everything besides the query vector that
+    changes what a search returns."""
+    return (
+        collection_type,
+        group_id,
+        agent,
+        tuple(memory_types) if memory_types else None,
+        story_id,
+        limit,
+        score_threshold,
+        tuple(str(cond) for cond in base_conditions) if base_conditions else None,
+    )
+
+
+def _build_filter(
+    group_id: Optional[str],
+    agent: Optional[str],
+    memory_types: Optional[list[str]],
+    story_id: Optional[str],
+    base_conditions: Optional[list],
+):
+    """Build the Qdrant metadata filter shared by the sync and async paths."""
+    FieldCondition, Filter, MatchAny, MatchValue = _get_qdrant_models()
+
+    must_conditions = list(base_conditions) if base_conditions else []
+    if group_id:
+        must_conditions.append(
+            FieldCondition(key="group_id", match=MatchValue(value=group_id))
+        )
+    if agent:
+        must_conditions.append(FieldCondition(key="agent", match=MatchValue(value=agent)))
+    if memory_types:
+        must_conditions.append(FieldCondition(key="type", match=MatchAny(any=memory_types)))
+    if story_id:
+        must_conditions.append(
+            FieldCondition(key="story_id", match=MatchValue(value=story_id))
+        )
+    return Filter(must=must_conditions) if must_conditions else None
+
+
+def _results_from_points(points) -> list[SearchResult]:
+    """Convert Qdrant scored points into SearchResult objects."""
+    results = []
+    for point in points:
+        payload = point.payload or {}
+        results.append(
+            SearchResult(
+                content=payload.get("content", ""),
+                score=point.score,
+                memory_type=payload.get("type", "unknown"),
+                agent=payload.get("agent", "unknown"),
+                created_at=payload.get("created_at", ""),
+                metadata=payload,
+            )
+        )
+    return results
+
+
+def search_memories(
+    query: str,
+    collection_type: str = "memory",
+    group_id: Optional[str] = None,
+    agent: Optional[str] = None,
+    memory_types: Optional[list[str]] = None,
+    story_id: Optional[str] = None,
+    limit: int = 5,
+    score_threshold: float = 0.7,
+    base_conditions: Optional[list] = None,
+) -> list[SearchResult]:
+    """Semantic search over a memory collection, filtered by metadata.
+
+    ``base_conditions`` lets callers pass pre-built FieldCondition objects
+    (e.g. a group_id condition reused across every search in a hook) so
+    they are not reallocated per call.
+    """
+    key = _cache_key(
+        collection_type, group_id, agent, memory_types, story_id, limit, score_threshold, base_conditions
+    )
+    exact_key = (query,) + key
+    exact = _exact_get(exact_key)
+    if exact is not None:
+        return exact
+
+    config = get_memory_config(collection_type)
+    client = get_client()
+    model = get_embedding_model()
+
+    # Keep the embedding as a contiguous float32 array; qdrant_client
+    # serializes numpy vectors directly, skipping 384 boxed PyFloats.
+    query_embedding = model.encode(query, convert_to_numpy=True).astype(
+        np.float32, copy=False
+    )
+    cached = _query_cache.get(query_embedding, key)
+    if cached is not None:
+        _exact_put(exact_key, cached)
+        return cached
+    search_filter = _build_filter(group_id, agent, memory_types, story_id, base_conditions)
+
+    response = client.query_points(
+        collection_name=config["collection_name"],
+        query=query_embedding,
+        query_filter=search_filter,
+        limit=limit,
+        score_threshold=score_threshold,
+        with_payload=True,
+    )
+    results = _results_from_points(response.points)
+    _query_cache.put(query_embedding, key, results)
+    _exact_put(exact_key, results)
+    return results
+
+
+_query_request_cls = None
+
+
+def _get_query_request():
+    global _query_request_cls
+    if _query_request_cls is None:
+        from qdrant_client.models import QueryRequest
+
+        _query_request_cls = QueryRequest
+    return _query_request_cls
+
+
+def search_memories_batch(
+    queries: list[str],
+    collection_types: Optional[list[str]] = None,
+    limit: int = 5,
+    score_threshold: float = 0.7,
+) -> list[list[SearchResult]]:
+    """Run several semantic searches as one pipeline.
+
+    All query strings go through a single embedding forward pass, and
+    queries against the same collection share one ``query_batch_points``
+    RPC, so N searches cost one encode plus one round-trip per distinct
+    collection instead of N of each.
+    """
+    if not queries:
+        return []
+    if collection_types is None:
+        collection_types = ["memory"] * len(queries)
+    model = get_embedding_model()
+    if hasattr(model, "encode_batch"):
+        embeddings = model.encode_batch(queries)
+    else:
+        embeddings = model.encode(queries, convert_to_numpy=True)
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+
+    groups: dict[str, list[int]] = {}
+    for index, collection_type in enumerate(collection_types):
+        groups.setdefault(collection_type, []).append(index)
+
+    QueryRequest = _get_query_request()
+    client = get_client()
+    out: list[list[SearchResult]] = [[] for _ in queries]
+    for collection_type, indices in groups.items():
+        config = get_memory_config(collection_type)
+        requests = [
+            QueryRequest(
+                query=embeddings[index].tolist(),
+                limit=limit,
+                score_threshold=score_threshold,
+                with_payload=True,
+            )
+            for index in indices
+        ]
+        responses = client.query_batch_points(
+            collection_name=config["collection_name"], requests=requests
+        )
+        for index, response in zip(indices, responses):
+            out[index] = _results_from_points(response.points)
+    return out
+
+
+async def search_memories_async(
+    query: str,
+    collection_type: str = "memory",
+    group_id: Optional[str] = None,
+    agent: Optional[str] = None,
+    memory_types: Optional[list[str]] = None,
+    story_id: Optional[str] = None,
+    limit: int = 5,
+    score_threshold: float = 0.7,
+    base_conditions: Optional[list] = None,
+) -> list[SearchResult]:
+    """Async variant of :func:`search_memories`.
+
+    The embedding forward pass runs in the default executor so it overlaps
+    with other searches' network waits when gathered concurrently.
+    """
+    config = get_memory_config(collection_type)
+    client = get_async_client()
+    model = get_embedding_model()
+
+    loop = asyncio.get_running_loop()
+    query_embedding = await loop.run_in_executor(None, model.encode, query)
+    query_embedding = query_embedding.astype(np.float32, copy=False)
+    key = _cache_key(
+        collection_type, group_id, agent, memory_types, story_id, limit, score_threshold, base_conditions
+    )
+    cached = _query_cache.get(query_embedding, key)
+    if cached is not None:
+        return cached
+    search_filter = _build_filter(group_id, agent, memory_types, story_id, base_conditions)
+
+    response = await client.query_points(
+        collection_name=config["collection_name"],
+        query=query_embedding,
+        query_filter=search_filter,
+        limit=limit,
+        score_threshold=score_threshold,
+        with_payload=True,
+    )
+    results = _results_from_points(response.points)
+    _query_cache.put(query_embedding, key, results)
+    return results
+
+
+def merge_topk(
+    result_lists: tuple[list[SearchResult], ...],
+    limit: Optional[int] = None,
+) -> list[SearchResult]:
+    """Rank-merge several result lists by score, best first.
+
+    Scores go through one float32 array and the compiled selection kernel
+    instead of sorting Python tuples; hybrid hook paths use this so the
+    token-budget trim consumes the strongest hits first.
+    """
+    candidates = [result for results in result_lists for result in results]
+    if len(candidates) <= 1:
+        return candidates
+    scores = np.fromiter(
+        ((candidate.score or 0.0) for candidate in candidates),
+        dtype=np.float32,
+        count=len(candidates),
+    )
+    _, ids = topk(scores, limit if limit is not None else len(candidates))
+    return [candidates[i] for i in ids]
+
+
+def format_for_context(results: list[SearchResult], max_tokens: int = 1000) -> str:
+    """Join search results into a context block within a token budget."""
+    if not results:
+        return ""
+    selected = []
+    total_tokens = 0
+    for result in results:
+        result_tokens = result.estimated_tokens()
+        if total_tokens + result_tokens > max_tokens:
+            break
+        selected.append(result)
+        total_tokens += result_tokens
+    # Single write buffer: one pass and one final allocation, instead of
+    # join's extra size-measuring traversal over an intermediate list.
+    buf = io.StringIO()
+    first = True
+    for result in selected:
+        if not first:
+            buf.write("\n\n")
+        buf.write(result.format_for_context())
+        first = False
+    return buf.getvalue()
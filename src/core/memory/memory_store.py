@@ -0,0 +1,451 @@
+"""Write path for the agent memory layer: embedding + Qdrant upserts."""
+
+import hashlib
+import os
+import sys
+import threading
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+from .config import get_memory_config
+from .hashing import day_stamp
+from .models import MemoryShard
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+_ONNX_CACHE_DIR = Path.home() / ".cache" / "bmad" / "onnx-minilm"
+
+
+class _OnnxEmbedder:
+    """`.encode`-compatible wrapper around an int8-quantized ONNX session."""
+
+    def __init__(self, tokenizer, session):
+        self._tokenizer = tokenizer
+        self._session = session
+        self._input_names = {inp.name for inp in session.get_inputs()}
+
+    def encode(self, text: str, convert_to_numpy: bool = True) -> np.ndarray:
+        return self.encode_batch([text])[0]
+
+    def encode_batch(self, texts: list[str]) -> np.ndarray:
+        encoded = self._tokenizer(texts, return_tensors="np", truncation=True, padding=True)
+        feeds = {k: v for k, v in encoded.items() if k in self._input_names}
+        hidden = self._session.run(None, feeds)[0]
+        # Mean pooling over valid tokens, then L2-normalize — matches the
+        # sentence-transformers MiniLM pipeline.
+        mask = encoded["attention_mask"][..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        vectors = pooled.astype(np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+def _load_onnx_embedder(model_name: str):
+    """Build (or reuse) an int8 ONNX Runtime embedder, or None if the
+    optional ONNX stack is not installed."""
+    try:
+        import onnxruntime
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+    except ImportError:
+        return None
+    try:
+        quantized_path = _ONNX_CACHE_DIR / "model-int8.onnx"
+        if not quantized_path.exists():
+            _ONNX_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            exported = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+            exported.save_pretrained(_ONNX_CACHE_DIR)
+            quantize_dynamic(
+                _ONNX_CACHE_DIR / "model.onnx",
+                quantized_path,
+                weight_type=QuantType.QInt8,
+            )
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = _embed_threads()
+        session = onnxruntime.InferenceSession(
+            str(quantized_path),
+            sess_options=session_options,
+            providers=["CPUExecutionProvider"],
+        )
+        return _OnnxEmbedder(tokenizer, session)
+    except Exception as exc:
+        print(f"[bmad-memory] ONNX embedder unavailable, using torch: {exc}", file=sys.stderr)
+        return None
+
+
+def _embed_threads() -> int:
+    return int(os.getenv("BMAD_EMBED_THREADS", str(os.cpu_count() or 4)))
+
+
+def _configure_torch() -> None:
+    """Pin the intra-op thread pool and disable autograd for inference.
+
+    Containerized hosts often miscompute the default pool size, and
+    sentence-transformers leaves gradient tracking on; both cost encode
+    throughput for free.
+    """
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(_embed_threads())
+    torch.set_grad_enabled(False)
+
+
+def _load_sentence_transformer(model_name: str):
+    """Load the sentence-transformers fallback with a fast backend.
+
+    BMAD_EMBED_BACKEND selects the encode path: "onnx" uses the O4
+    optimized ONNX export (2-4x on CPU), "fp16" uses half-precision
+    torch weights (for CUDA hosts), anything else is the stock fp32
+    model.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    _configure_torch()
+    backend = os.getenv("BMAD_EMBED_BACKEND", "")
+    if backend == "onnx":
+        model = SentenceTransformer(
+            model_name,
+            backend="onnx",
+            model_kwargs={"file_name": "onnx/model_O4.onnx"},
+        )
+    elif backend == "fp16":
+        model = SentenceTransformer(model_name, model_kwargs={"torch_dtype": "float16"})
+    else:
+        model = SentenceTransformer(model_name)
+    model.eval()
+    # Bound sequence length to the shard content ceiling instead of the
+    # model's default: shorter sequences mean quadratically less
+    # attention work on padded batches. Raise via env for longer shards.
+    model.max_seq_length = int(os.getenv("BMAD_EMBED_MAX_SEQ", "128"))
+    return model
+
+
+# Process-wide singletons. Module globals make the warm-path check a single
+# LOAD_GLOBAL instead of a hasattr() round-trip per call; the lock is only
+# taken on the cold path.
+_MODEL = None
+_CLIENT = None
+# Async clients are cached per event loop, not process-wide: the client
+# binds its gRPC aio channel / connection pool to the loop it is created
+# under, and sync wrappers drive the async path through asyncio.run,
+# which closes its loop on return.
+_ASYNC_CLIENTS: dict = {}
+_INIT_LOCK = threading.Lock()
+
+
+def get_embedding_model():
+    """Return the process-wide embedding model (lazy singleton).
+
+    Prefers an int8-quantized ONNX Runtime session (2-4x faster on CPU
+    than the fp32 torch path); falls back to sentence-transformers when
+    the ONNX stack is not installed.
+    """
+    global _MODEL
+    if _MODEL is None:
+        with _INIT_LOCK:
+            if _MODEL is None:
+                from .embed_daemon import SOCKET_PATH, SocketEmbedder
+
+                # Prefer the resident daemon whenever its socket is live:
+                # CLI invocations then skip the torch import entirely.
+                socket_path = os.getenv("BMAD_EMBED_SOCKET") or (
+                    SOCKET_PATH if os.path.exists(SOCKET_PATH) else None
+                )
+                if socket_path:
+                    _MODEL = SocketEmbedder(socket_path)
+                    return _MODEL
+                config = get_memory_config()
+                model = _load_onnx_embedder(config["embedding_model"])
+                if model is None:
+                    model = _load_sentence_transformer(config["embedding_model"])
+                _MODEL = model
+    return _MODEL
+
+
+def _client_kwargs(config: dict) -> dict:
+    """Shared Qdrant client construction arguments.
+
+    Keep-alive pings hold the gRPC channel open across the many
+    sequential calls a workflow makes, so only the first call pays
+    connection setup.
+    """
+    kwargs = {
+        "url": config["url"],
+        "api_key": config["api_key"] or None,
+        "timeout": config["timeout"],
+        "prefer_grpc": config["prefer_grpc"],
+        "grpc_port": config["grpc_port"],
+    }
+    if config["prefer_grpc"]:
+        kwargs["grpc_options"] = {"grpc.keepalive_time_ms": 30000}
+    return kwargs
+
+
+def get_client():
+    """Return the process-wide Qdrant client (lazy singleton)."""
+    global _CLIENT
+    if _CLIENT is None:
+        with _INIT_LOCK:
+            if _CLIENT is None:
+                from qdrant_client import QdrantClient
+
+                config = get_memory_config()
+                # gRPC ships vectors as repeated float32 protobuf fields,
+                # skipping per-element float -> str JSON conversion.
+                _CLIENT = QdrantClient(**_client_kwargs(config))
+    return _CLIENT
+
+
+def get_async_client():
+    """Return the async Qdrant client bound to the running event loop.
+
+    A process-wide singleton would be created on the first caller's loop;
+    once that loop is closed (every ``asyncio.run`` round-trip closes its
+    loop) the cached client's channel is dead and the next call fails
+    with "Event loop is closed". Keying on the running loop gives each
+    loop a client whose connections it owns. Must be called from within
+    a running loop.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None:
+        from qdrant_client import AsyncQdrantClient
+
+        # Drop entries for loops that have since closed so short-lived
+        # asyncio.run loops do not accumulate dead clients.
+        for stale in [cached for cached in _ASYNC_CLIENTS if cached.is_closed()]:
+            del _ASYNC_CLIENTS[stale]
+        config = get_memory_config()
+        client = AsyncQdrantClient(**_client_kwargs(config))
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+def warm_memory() -> None:
+    """Eagerly load the embedding model and Qdrant client.
+
+    CLI entrypoints call this in a background thread before argument
+    parsing so the multi-second model cold start overlaps with the rest
+    of their startup instead of landing on the first encode.
+    """
+    get_embedding_model()
+    get_client()
+
+
+def generate_unique_id(content: str, prefix: str = "mem") -> str:
+    """Derive a stable unique id from shard content and the current day."""
+    base = f"{content}-{day_stamp('%Y%m%d')}"
+    digest = hashlib.sha256(base.encode()).hexdigest()[:12]
+    return f"{prefix}-{digest}"
+
+
+def _json_safe_payload(shard: MemoryShard) -> dict:
+    """Return the shard payload as plain JSON-ready primitives.
+
+    Round-tripping through orjson (when available) normalizes the payload
+    in C instead of leaving per-field coercion to the HTTP client's
+    stdlib-json encoder, which is the slow part of batch upserts.
+    """
+    payload = shard.to_payload()
+    if orjson is not None:
+        return orjson.loads(orjson.dumps(payload))
+    return payload
+
+
+def _point_id(unique_id: str) -> str:
+    """Map a shard unique_id to a deterministic Qdrant point UUID."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, unique_id))
+
+
+def store_memory(shard: MemoryShard, collection_type: str = "memory") -> bool:
+    """Store a single shard. Returns True on success."""
+    return store_batch([shard], collection_type=collection_type) == 1
+
+
+def bulk_ingest(
+    shards: list[MemoryShard],
+    collection_type: str = "memory",
+    chunk_size: int = 1000,
+) -> int:
+    """Ingest a large shard set with HNSW index building deferred.
+
+    Incremental HNSW maintenance dominates bulk reseeds (migrations,
+    reindexes). Disable graph build and small-segment optimization for
+    the duration, stream the shards through store_batch, then restore the
+    index config so Qdrant rebuilds in the background.
+    """
+    from qdrant_client.models import HnswConfigDiff, OptimizersConfigDiff
+
+    config = get_memory_config(collection_type)
+    client = get_client()
+    collection = config["collection_name"]
+
+    client.update_collection(
+        collection_name=collection,
+        hnsw_config=HnswConfigDiff(m=0),
+        optimizers_config=OptimizersConfigDiff(indexing_threshold=0),
+    )
+    stored = 0
+    try:
+        for start in range(0, len(shards), chunk_size):
+            stored += store_batch(
+                shards[start : start + chunk_size], collection_type=collection_type
+            )
+    finally:
+        client.update_collection(
+            collection_name=collection,
+            hnsw_config=HnswConfigDiff(m=16),
+            optimizers_config=OptimizersConfigDiff(indexing_threshold=20000),
+        )
+    return stored
+
+
+def flush_memory(collection_type: str = "memory") -> None:
+    """End-of-workflow barrier for fire-and-forget upserts.
+
+    A synchronous no-op read that only returns once the server has
+    applied previously submitted operations on the collection.
+    """
+    config = get_memory_config(collection_type)
+    try:
+        get_client().count(collection_name=config["collection_name"])
+    except Exception as exc:
+        print(f"[bmad-memory] flush_memory failed: {exc}", file=sys.stderr)
+
+
+_DISK_CACHE = None
+
+
+def _get_disk_cache():
+    """Return the shared on-disk embedding cache, or None if unusable."""
+    global _DISK_CACHE
+    if _DISK_CACHE is None:
+        from .embed_cache import DiskEmbeddingCache
+
+        try:
+            _DISK_CACHE = DiskEmbeddingCache()
+        except Exception as exc:
+            print(f"[bmad-memory] embedding cache disabled: {exc}", file=sys.stderr)
+            _DISK_CACHE = False
+    return _DISK_CACHE or None
+
+
+def _encode_ordered(model, contents: list[str]):
+    """Encode contents, returning embeddings in source order.
+
+    Content already seen by a previous invocation (reruns, retries) comes
+    out of the on-disk hash cache without touching the model. Misses use
+    smart batching: encode in length order so each minibatch pads to
+    similar sequence lengths instead of the global maximum, then scatter
+    the embeddings back through the inverse permutation.
+    """
+    cache = _get_disk_cache()
+    embeddings = [None] * len(contents)
+    misses = []
+    if cache is not None:
+        for index, content in enumerate(contents):
+            cached = cache.get(content)
+            if cached is not None:
+                embeddings[index] = cached
+            else:
+                misses.append(index)
+    else:
+        misses = list(range(len(contents)))
+    if not misses:
+        return embeddings
+
+    order = sorted(misses, key=lambda i: len(contents[i]))
+    if hasattr(model, "encode_batch"):
+        encoded = model.encode_batch([contents[i] for i in order])
+    else:
+        encoded = model.encode(
+            [contents[i] for i in order], batch_size=32, show_progress_bar=False
+        )
+    for position, source_index in enumerate(order):
+        embeddings[source_index] = encoded[position]
+        if cache is not None:
+            cache.put(contents[source_index], encoded[position])
+    return embeddings
+
+
+def _points_from(shards: list[MemoryShard], embeddings) -> list:
+    from qdrant_client.models import PointStruct
+
+    # Contiguous float32 pass-through: the client serializes ndarrays
+    # without boxing each element into a PyFloat first.
+    return [
+        PointStruct(
+            id=_point_id(shard.unique_id),
+            vector=np.ascontiguousarray(embeddings[index], dtype=np.float32),
+            payload=_json_safe_payload(shard),
+        )
+        for index, shard in enumerate(shards)
+    ]
+
+
+# Chunk size for the encode/upload pipeline: small enough to overlap
+# compute with network, large enough to amortize per-request overhead.
+_PIPELINE_CHUNK = 64
+
+
+def store_batch(
+    shards: list[MemoryShard],
+    collection_type: str = "memory",
+    durability: str = "flush",
+) -> int:
+    """Embed and upsert a batch of shards. Returns the number stored.
+
+    Large batches are pipelined: the next chunk encodes on a background
+    thread while the current chunk uploads, keeping the encoder and the
+    network busy simultaneously.
+
+    ``durability="fsync"`` blocks until the points are persisted (the old
+    behavior). The default submits without waiting; callers that need a
+    barrier invoke :func:`flush_memory` once at end of workflow instead
+    of paying a round-trip fsync per batch.
+    """
+    if not shards:
+        return 0
+    from concurrent.futures import ThreadPoolExecutor
+
+    config = get_memory_config(collection_type)
+    client = get_client()
+    model = get_embedding_model()
+
+    chunks = [shards[i : i + _PIPELINE_CHUNK] for i in range(0, len(shards), _PIPELINE_CHUNK)]
+    stored = 0
+    try:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(_encode_ordered, model, [s.content for s in chunks[0]])
+            for index, chunk in enumerate(chunks):
+                embeddings = future.result()
+                if index + 1 < len(chunks):
+                    future = pool.submit(
+                        _encode_ordered, model, [s.content for s in chunks[index + 1]]
+                    )
+                client.upsert(
+                    collection_name=config["collection_name"],
+                    points=_points_from(chunk, embeddings),
+                    wait=durability == "fsync",
+                )
+                stored += len(chunk)
+    except Exception as exc:
+        print(f"[bmad-memory] store_batch failed: {exc}", file=sys.stderr)
+    if stored:
+        # Lazy import: memory_search imports this module at load time.
+        from .memory_search import invalidate_search_cache
+
+        invalidate_search_cache(collection_type)
+    return stored
@@ -0,0 +1,156 @@
+"""Data models for memory shards and search results."""
+
+from enum import IntEnum
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+_UNSET = object()
+_encoder = _UNSET
+
+
+def _get_encoder():
+    """Return the shared tiktoken encoder, or None if tiktoken is absent.
+
+    Loaded lazily so importing the models module stays cheap for hooks
+    that never measure tokens.
+    """
+    global _encoder
+    if _encoder is _UNSET:
+        try:
+            import tiktoken
+
+            _encoder = tiktoken.get_encoding("cl100k_base")
+        except ImportError:
+            _encoder = None
+    return _encoder
+
+MemoryType = Literal[
+    "story-outcome",
+    "architecture-decision",
+    "error-pattern",
+    "implementation",
+    "best-practice",
+    "session-summary",
+]
+
+ImportanceLevel = Literal["low", "medium", "high", "critical"]
+
+
+class Importance(IntEnum):
+    """Importance levels as ints so ranking code compares integers.
+
+    Shard payloads keep the string labels (Qdrant filters match on
+    them); this enum is the in-process representation for sorts.
+    """
+
+    low = 0
+    medium = 1
+    high = 2
+    critical = 3
+
+    @classmethod
+    def from_label(cls, label: str) -> "Importance":
+        return cls.__members__.get(label, cls.medium)
+
+
+class MemoryShard(BaseModel):
+    """A single unit of agent memory stored in Qdrant."""
+
+    unique_id: str
+    content: str
+    type: MemoryType
+    agent: str
+    group_id: str
+    importance: ImportanceLevel = "medium"
+    component: Optional[str] = None
+    story_id: Optional[str] = None
+    epic_id: Optional[str] = None
+    created_at: str = ""
+    tags: list[str] = Field(default_factory=list)
+
+    _payload: Optional[dict] = PrivateAttr(default=None)
+
+    def to_payload(self) -> dict:
+        """Return the Qdrant payload for this shard.
+
+        Shards are logically immutable once built, so the payload dict is
+        computed once and reused across store retries and batch paths.
+        """
+        if self._payload is None:
+            payload = self.model_dump()
+            self._payload = {
+                key: value for key, value in payload.items() if value is not None
+            }
+        return self._payload
+
+
+class SearchResult:
+    """A scored memory returned by :func:`search_memories`.
+
+    Slotted: result objects are created in bulk on every search and
+    cached by the semantic query cache, so skipping the per-instance
+    ``__dict__`` saves ~300 bytes each and keeps attribute access on the
+    fast path.
+    """
+
+    __slots__ = (
+        "content",
+        "score",
+        "memory_type",
+        "agent",
+        "created_at",
+        "metadata",
+        "_cached_tokens",
+        "_cached_format",
+    )
+
+    def __init__(
+        self,
+        content: str,
+        score: float,
+        memory_type: str,
+        agent: str,
+        created_at: str,
+        metadata: Optional[dict] = None,
+    ):
+        self.content = content
+        self.score = score
+        self.memory_type = memory_type
+        self.agent = agent
+        self.created_at = created_at
+        self.metadata = metadata or {}
+        self._cached_tokens: Optional[int] = None
+        self._cached_format: Optional[str] = None
+
+    def estimated_tokens(self) -> int:
+        """Token count of the rendered block, memoized on the instance.
+
+        Uses tiktoken's BPE when available for accurate budgeting; falls
+        back to the ~4 chars/token heuristic otherwise.
+        """
+        if self._cached_tokens is None:
+            encoder = _get_encoder()
+            if encoder is not None:
+                self._cached_tokens = len(encoder.encode_ordinary(self.format_for_context()))
+            else:
+                self._cached_tokens = len(self.content) >> 2
+        return self._cached_tokens
+
+    def format_for_context(self) -> str:
+        """Render this result as a context block, memoized on the instance.
+
+        Results resurface via the semantic query cache and via hooks that
+        share overlapping result sets in one turn; re-rendering is pure
+        repeated string construction.
+        """
+        if self._cached_format is None:
+            self._cached_format = self._render()
+        return self._cached_format
+
+    def _render(self) -> str:
+        header = (
+            f"[{self.memory_type} | {self.agent} | "
+            f"{self.created_at[:10]} | score {self.score:.2f}]"
+        )
+        return f"{header}\n{self.content}"
@@ -0,0 +1,90 @@
+"""Per-agent token budgets for memory context injection."""
+
+from enum import IntEnum
+
+import numpy as np
+
+
+class AgentId(IntEnum):
+    """Agent roles as small ints so budget lookup is a tuple index."""
+
+    architect = 0
+    dev = 1
+    qa = 2
+    analyst = 3
+    pm = 4
+    sm = 5
+
+
+# Budgets indexed by AgentId ordinal — tokens of retrieved memory each
+# role may spend per turn.
+_BUDGETS = (1500, 1000, 1000, 800, 800, 600)
+
+_AGENT_INDEX = {agent.name: agent.value for agent in AgentId}
+
+# Kept for callers that iterate the mapping by name.
+AGENT_TOKEN_BUDGETS = {agent.name: _BUDGETS[agent.value] for agent in AgentId}
+
+DEFAULT_TOKEN_BUDGET = 800
+
+_UNSET = object()
+_tokenizer = _UNSET
+
+
+def _get_tokenizer():
+    """Return the embedding model's Rust fast tokenizer, or None.
+
+    The model is already resident in any flow that budgets tokens, so
+    borrowing its tokenizer costs nothing extra; daemon-proxy models
+    expose no tokenizer and fall back to the chars/4 heuristic.
+    """
+    global _tokenizer
+    if _tokenizer is _UNSET:
+        try:
+            from .memory_store import get_embedding_model
+
+            model = get_embedding_model()
+            _tokenizer = getattr(model, "tokenizer", None) or getattr(
+                model, "_tokenizer", None
+            )
+        except Exception:
+            _tokenizer = None
+    return _tokenizer
+
+
+def count_tokens(text: str) -> int:
+    """Exact token count via the fast tokenizer, heuristic otherwise."""
+    tokenizer = _get_tokenizer()
+    if tokenizer is not None:
+        return len(tokenizer.encode(text, add_special_tokens=False))
+    return len(text) >> 2
+
+
+def get_token_budget(agent) -> int:
+    """Return the memory token budget for an agent role.
+
+    Accepts an :class:`AgentId` (plain tuple index) or a role name
+    string for backward compatibility.
+    """
+    if isinstance(agent, int):
+        return _BUDGETS[agent]
+    index = _AGENT_INDEX.get(agent)
+    return _BUDGETS[index] if index is not None else DEFAULT_TOKEN_BUDGET
+
+
+def get_optimal_context(results, max_tokens: int):
+    """Select the highest-scoring results that fit within ``max_tokens``.
+
+    Results are assumed to be sorted by score descending (as returned by
+    search). The cutoff is found branchlessly with a prefix sum instead
+    of a per-result compare-and-break loop.
+    """
+    if not results:
+        return []
+    tokens = np.fromiter(
+        (count_tokens(result.content) for result in results),
+        dtype=np.int32,
+        count=len(results),
+    )
+    cutoff = int(np.searchsorted(tokens.cumsum(), max_tokens, side="right"))
+    return list(results[:cutoff])
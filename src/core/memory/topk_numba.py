@@ -0,0 +1,81 @@
+"""Top-k selection over candidate score arrays, JIT-compiled when numba is present.
+
+Hybrid search paths merge several Qdrant result lists before trimming to a
+token budget; ranking that merge is a pure compute loop over float32 scores.
+With numba the heap select runs as native code (cache=True keeps the
+compiled kernel across processes); without it, numpy argpartition is still
+far cheaper than sorting Python tuples.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _topk_heap(scores, k):
+        n = scores.shape[0]
+        heap_scores = np.empty(k, np.float32)
+        heap_ids = np.empty(k, np.int64)
+        size = 0
+        for i in range(n):
+            score = scores[i]
+            if size < k:
+                # Push onto the min-heap and sift up.
+                pos = size
+                heap_scores[pos] = score
+                heap_ids[pos] = i
+                size += 1
+                while pos > 0:
+                    parent = (pos - 1) // 2
+                    if heap_scores[pos] < heap_scores[parent]:
+                        heap_scores[pos], heap_scores[parent] = (
+                            heap_scores[parent],
+                            heap_scores[pos],
+                        )
+                        heap_ids[pos], heap_ids[parent] = heap_ids[parent], heap_ids[pos]
+                        pos = parent
+                    else:
+                        break
+            elif score > heap_scores[0]:
+                # Replace the root and sift down.
+                heap_scores[0] = score
+                heap_ids[0] = i
+                pos = 0
+                while True:
+                    left = 2 * pos + 1
+                    right = left + 1
+                    smallest = pos
+                    if left < size and heap_scores[left] < heap_scores[smallest]:
+                        smallest = left
+                    if right < size and heap_scores[right] < heap_scores[smallest]:
+                        smallest = right
+                    if smallest == pos:
+                        break
+                    heap_scores[pos], heap_scores[smallest] = (
+                        heap_scores[smallest],
+                        heap_scores[pos],
+                    )
+                    heap_ids[pos], heap_ids[smallest] = heap_ids[smallest], heap_ids[pos]
+                    pos = smallest
+        order = np.argsort(heap_scores[:size])[::-1]
+        return heap_scores[:size][order], heap_ids[:size][order]
+
+
+def topk(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Indices and values of the k largest scores, best first."""
+    scores = np.ascontiguousarray(scores, dtype=np.float32)
+    k = min(k, scores.shape[0])
+    if k == 0:
+        return np.empty(0, np.float32), np.empty(0, np.int64)
+    if njit is not None:
+        return _topk_heap(scores, k)
+    ids = np.argpartition(scores, -k)[-k:]
+    order = np.argsort(scores[ids])[::-1]
+    ids = ids[order].astype(np.int64)
+    return scores[ids], ids
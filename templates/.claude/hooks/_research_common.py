@@ -0,0 +1,115 @@
+"""Shared extraction logic for the research best-practice hooks.
+
+Both research_best_practices entry points import from here, so fixes
+land once and a second hook invocation in the same process reuses the
+already-compiled module from sys.modules.
+"""
+
+import re
+
+RESEARCH_AGENT_TYPES = ("researcher", "research-agent", "analyst")
+RESEARCH_TASK_KEYWORDS = ("research", "investigate", "explore", "evaluate", "compare")
+
+BEST_PRACTICE_PATTERNS = (
+    "best practice",
+    "recommended approach",
+    "proven pattern",
+    "industry standard",
+    "canonical way",
+    "idiomatic",
+    "convention",
+    "guideline",
+    "should always",
+    "must always",
+    "never do",
+    "avoid",
+    "anti-pattern",
+)
+
+# One compiled alternation, searched once per paragraph, instead of a
+# per-pattern re.search loop that re-resolves 13 patterns every call.
+# Matched against pre-lowered text, so no IGNORECASE: a case-sensitive
+# literal scan is cheaper than case-folding inside the regex engine.
+BEST_PRACTICE_RE = re.compile("|".join(map(re.escape, BEST_PRACTICE_PATTERNS)))
+
+# All indicators are literal substrings, so an Aho-Corasick automaton
+# finds the first one in a single linear pass over the paragraph; the
+# compiled alternation stays as the fallback when pyahocorasick is not
+# installed.
+try:
+    import ahocorasick
+
+    _BP_AHO = ahocorasick.Automaton()
+    for _pattern in BEST_PRACTICE_PATTERNS:
+        _BP_AHO.add_word(_pattern, _pattern)
+    _BP_AHO.make_automaton()
+except ImportError:
+    _BP_AHO = None
+
+
+def _has_indicator(lowered_paragraph: str) -> bool:
+    """Indicator check over an already-lowered paragraph."""
+    if _BP_AHO is not None:
+        return next(_BP_AHO.iter(lowered_paragraph), None) is not None
+    return BEST_PRACTICE_RE.search(lowered_paragraph) is not None
+
+
+def is_research_agent(agent_type: str, task_description: str) -> bool:
+    if agent_type in RESEARCH_AGENT_TYPES:
+        return True
+    lowered = task_description.lower()
+    return any(keyword in lowered for keyword in RESEARCH_TASK_KEYWORDS)
+
+
+_PARA_RE = re.compile(r"\n\s*\n")
+
+
+def extract_best_practices(content: str, limit: int = 20) -> list[str]:
+    """Paragraphs of the transcript that mention a best-practice indicator.
+
+    ``limit`` bounds the harvest: every kept paragraph is embedded and
+    upserted downstream, so capping here caps the per-run Qdrant work a
+    multi-MB transcript can generate.
+    """
+    best_practices = []
+    # One regex split yields paragraphs directly: no full line list, no
+    # per-line accumulator churn, no trailing-paragraph special case.
+    for paragraph in _PARA_RE.split(content):
+        paragraph = " ".join(paragraph.split())
+        # Lower once per paragraph and hand the lowered buffer to the
+        # matcher; both matcher paths previously case-folded on their own.
+        if paragraph and _has_indicator(paragraph.lower()):
+            best_practices.append(paragraph)
+            if len(best_practices) >= limit:
+                break
+    return best_practices
+
+
+# One compiled scan with named groups replaces ten sequential
+# any(keyword in text) passes. The \b boundaries also fix the latent
+# substring bug where "py" matched "copy" and "ts" matched "points".
+_CATEGORY_RE = re.compile(
+    r"(?P<python>\b(?:python|py|django|flask)\b)"
+    r"|(?P<javascript>\b(?:javascript|js|node|npm)\b)"
+    r"|(?P<typescript>\b(?:typescript|ts|tsx)\b)"
+    r"|(?P<database>\b(?:sql|database|query|schema)\b)"
+    r"|(?P<shell>\b(?:shell|bash|script)\b)"
+    r"|(?P<testing>\b(?:test|testing|assertion|coverage)\b)"
+    r"|(?P<security>\b(?:security|auth|secret|vulnerability)\b)"
+    r"|(?P<api>\b(?:api|endpoint|rest|http)\b)"
+    r"|(?P<architecture>\b(?:architecture|design|pattern|module)\b)"
+    r"|(?P<devops>\b(?:docker|container|kubernetes|deploy)\b)",
+    re.IGNORECASE,
+)
+
+
+def categorize_best_practice(practice_text: str) -> str:
+    match = _CATEGORY_RE.search(practice_text)
+    return f"{match.lastgroup}-best-practices" if match else "general-best-practices"
+
+
+def truncate_practice(text: str, max_chars: int = 800) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars)
+    return text[: cut if cut > 0 else max_chars] + "..."
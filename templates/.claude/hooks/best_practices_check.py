@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""PreToolUse hook: surface relevant best practices before a file is edited."""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+sys.path.insert(0, str(Path(os.getenv("BMAD_ROOT", Path(__file__).resolve().parents[2])) / "src"))
+
+
+_CATEGORY_MAP = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".sql": "sql",
+    ".sh": "shell",
+    ".yaml": "config",
+    ".yml": "config",
+    ".md": "documentation",
+}
+_SUPPORTED_EXTS = tuple(_CATEGORY_MAP)
+
+
+def get_best_practice_category(file_path: str):
+    # endswith against a tuple is a single C-level loop and rejects the
+    # common uninteresting extensions before any splitting happens.
+    if not file_path.endswith(_SUPPORTED_EXTS):
+        return None
+    return _CATEGORY_MAP[file_path[file_path.rfind(".") :]]
+
+
+def _search_pair(queries: list[str], collection_types: list[str], limit: int) -> list[list[str]]:
+    """Local HNSW mirror when faiss is available, one batched RPC otherwise.
+
+    Both query strings are embedded in a single forward pass either way.
+    """
+    # Imported here, not at module top: torch/qdrant cost ~0.5-1.5s and
+    # most edits bail out on the extension check before needing them.
+    from core.memory import search_memories_batch
+    from core.memory import local_ann
+    from core.memory.memory_store import get_embedding_model
+
+    mirror = local_ann.get_mirror()
+    if mirror is not None:
+        model = get_embedding_model()
+        if hasattr(model, "encode_batch"):
+            vectors = model.encode_batch(queries)
+        else:
+            vectors = model.encode(queries)
+        return [
+            [
+                hit.get("content", "")
+                for hit in mirror.query(vector, k=limit, collection_type=collection_type, min_score=0.6)
+            ]
+            for vector, collection_type in zip(vectors, collection_types)
+        ]
+    result_lists = search_memories_batch(
+        queries, collection_types, limit=limit, score_threshold=0.6
+    )
+    return [[result.content for result in results] for results in result_lists]
+
+
+def main() -> int:
+    payload = _loads(sys.stdin.buffer.read())
+    tool_input = payload.get("tool_input", {})
+    file_path = tool_input.get("file_path", "")
+    if not file_path:
+        return 0
+
+    category = get_best_practice_category(file_path)
+    if category is None:
+        return 0
+    file_name = os.path.basename(file_path)
+
+    try:
+        practices, related = _search_pair(
+            [f"{category} best practices", f"{category} {file_name} patterns"],
+            ["best-practices", "knowledge"],
+            3,
+        )
+    except Exception:
+        return 0  # never block the edit on memory errors
+
+    if not practices and not related:
+        return 0
+
+    # One buffered write instead of a print-per-line: stderr can be
+    # unbuffered under the hook runner, making every print a syscall.
+    parts = [f"[best-practices-check] guidance for {file_name}:\n"]
+    parts.extend(f"  - {practice}\n" for practice in practices)
+    parts.extend(f"  - {note}\n" for note in related)
+    sys.stderr.write("".join(parts))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
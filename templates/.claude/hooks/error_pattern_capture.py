@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""PostToolUse hook: capture failing Bash commands as error-pattern memories."""
+
+import json
+import os
+import re
+import sys
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(os.getenv("BMAD_ROOT", Path(__file__).resolve().parents[2])) / "src"))
+
+# Ordered tuple, not a set: the fallback scan pairs positionally with the
+# precompiled byte patterns below, and the automaton bakes the entries in
+# at import anyway.
+ERROR_INDICATORS = (
+    "error",
+    "exception",
+    "traceback",
+    "failed",
+    "failure",
+    "fatal",
+    "panic",
+    "segfault",
+    "undefined reference",
+    "cannot find",
+    "no such file",
+    "permission denied",
+    "syntax error",
+    "assertionerror",
+)
+
+def _casings(word: str) -> set:
+    """The casing variants tools actually emit: lower, Capitalized, UPPER."""
+    return {word, word.capitalize(), word.upper()}
+
+
+try:
+    import ahocorasick
+
+    # The automaton carries the casing variants itself, so the raw output
+    # buffer is scanned as-is with no lowered copy.
+    _AUTOMATON = ahocorasick.Automaton()
+    for _index, _word in enumerate(ERROR_INDICATORS):
+        for _variant in _casings(_word):
+            _AUTOMATON.add_word(_variant, (_index, _word))
+    _AUTOMATON.make_automaton()
+except ImportError:
+    _AUTOMATON = None
+
+# ASCII-only lowering table for the fallback path: bytes.translate is a
+# tight C loop with no allocation beyond the output buffer, unlike
+# str.lower()'s full unicode case mapping.
+_LOWER_TBL = bytes(c | 0x20 if 0x41 <= c <= 0x5A else c for c in range(256))
+_INDICATOR_BYTES = [indicator.encode() for indicator in ERROR_INDICATORS]
+
+ERROR_TYPE_MAP = {
+    "traceback": "python-exception",
+    "exception": "python-exception",
+    "assertionerror": "test-failure",
+    "syntax error": "syntax-error",
+    "segfault": "crash",
+    "panic": "crash",
+    "undefined reference": "link-error",
+    "no such file": "missing-file",
+    "cannot find": "missing-file",
+    "permission denied": "permissions",
+}
+
+
+def find_first_indicator(output: str):
+    """``(offset, indicator)`` of the earliest error indicator, or None.
+
+    With pyahocorasick all indicator casings match in one linear automaton
+    pass over the raw buffer; the fallback lowers once through the ASCII
+    translate table and scans bytes. Mixed casings neither path covers
+    still surface through the exit-code check.
+    """
+    if _AUTOMATON is not None:
+        match = next(_AUTOMATON.iter(output), None)
+        if match is None:
+            return None
+        end, (_, word) = match
+        return end - len(word) + 1, word
+    lowered = output.encode("utf-8", "surrogateescape").translate(_LOWER_TBL)
+    position = -1
+    found = None
+    for indicator, raw in zip(ERROR_INDICATORS, _INDICATOR_BYTES):
+        index = lowered.find(raw)
+        if index != -1 and (position == -1 or index < position):
+            position, found = index, indicator
+    return None if position == -1 else (position, found)
+
+
+def detect_error(exit_code: int, match) -> bool:
+    return exit_code != 0 or match is not None
+
+
+def extract_error_type(match) -> str:
+    if match is None:
+        return "generic-error"
+    return ERROR_TYPE_MAP.get(match[1], "generic-error")
+
+
+def truncate_output(output: str, match, max_chars: int = 2000) -> str:
+    """Keep a window around the first error indicator."""
+    if len(output) <= max_chars:
+        return output
+    if match is None:
+        return output[-max_chars:]
+    start = max(0, match[0] - max_chars // 4)
+    return output[start : start + max_chars]
+
+
+_COMPONENT_RE = re.compile(r"(?:src|tests?|scripts?)/([^/\s]+)")
+
+
+def extract_component_from_command(command: str) -> str:
+    match = _COMPONENT_RE.search(command)
+    return match.group(1) if match else "general"
+
+
+def create_error_content(command: str, output: str, exit_code: int, match) -> tuple[str, str]:
+    from core.memory.hashing import fast_short_hash
+
+    truncated = truncate_output(output, match)
+    error_hash = fast_short_hash(truncated, 16)
+    content = (
+        f"Command: {command}\n"
+        f"Exit code: {exit_code}\n"
+        f"Output:\n{truncated}"
+    )
+    return content, error_hash
+
+
+def main() -> int:
+    payload = _loads(sys.stdin.buffer.read())
+    tool_input = payload.get("tool_input", {})
+    tool_response = payload.get("tool_response", {})
+    command = tool_input.get("command", "")
+    output = str(tool_response.get("output", ""))
+    exit_code = int(tool_response.get("exit_code", 0) or 0)
+
+    # One pass feeds detection, typing, and truncation alike.
+    match = find_first_indicator(output)
+    if not command or not detect_error(exit_code, match):
+        return 0
+
+    # Only failing commands pay the torch/qdrant import below; successful
+    # runs exit above without touching the memory stack.
+    from core.memory import MemoryShard, store_memory
+
+    group_id = os.getenv("BMAD_GROUP_ID", "default")
+    try:
+        content, error_hash = create_error_content(command, output, exit_code, match)
+        shard = MemoryShard.model_construct(
+            unique_id=f"errcap-{error_hash}",
+            content=content,
+            type="error-pattern",
+            agent=os.getenv("BMAD_AGENT", "dev"),
+            group_id=group_id,
+            importance="high",
+            component=extract_component_from_command(command),
+            created_at=datetime.now().isoformat(),
+            tags=["error-capture", extract_error_type(match)],
+        )
+        stored = store_memory(shard)
+        if stored and os.getenv("BMAD_HOOK_VERBOSE"):
+            sys.stderr.write(f"[error-pattern-capture] stored {shard.unique_id}\n")
+    except Exception:
+        pass  # never fail the hook on memory errors
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""PostToolUse hook: store Write/Edit changes as implementation memories."""
+
+import functools
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(os.getenv("BMAD_ROOT", Path(__file__).resolve().parents[2])) / "src"))
+
+# Dedupe digest: xxh3_64 when available (an order of magnitude faster on
+# whole-file payloads), otherwise blake2b truncated to the same 16 hex
+# chars. Neither needs cryptographic strength for an id suffix.
+try:
+    import xxhash
+
+    _hash64 = xxhash.xxh3_64_hexdigest
+except ImportError:
+
+    def _hash64(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+# Writes that will never make useful implementation memories: logs,
+# lockfiles, build artifacts, binary assets.
+_SKIP_EXTS = frozenset(
+    {".log", ".lock", ".min.js", ".map", ".png", ".jpg", ".gif", ".pdf", ".zip", ".pyc"}
+)
+_SKIP_DIRS_RE = re.compile(r"/(?:node_modules|\.git|dist|build|__pycache__)/")
+
+_BANNER = f"\n{'=' * 60}\nIMPLEMENTATION STORAGE\n{'=' * 60}\n"
+
+
+def should_skip(file_path: str) -> bool:
+    if os.path.splitext(file_path)[1].lower() in _SKIP_EXTS:
+        return True
+    return _SKIP_DIRS_RE.search(file_path) is not None
+
+
+# Pure path-derivation helpers: sessions edit many files under the same
+# component, so repeat paths become a dict hit instead of string surgery.
+@functools.lru_cache(maxsize=4096)
+def extract_component_from_path(file_path: str) -> str:
+    parts = file_path.replace("\\", "/").split("/")
+    for marker in ("src", "lib", "tests", "scripts"):
+        if marker in parts:
+            index = parts.index(marker)
+            if index + 1 < len(parts):
+                return parts[index + 1]
+    return os.path.basename(os.path.dirname(file_path)) or "general"
+
+
+@functools.lru_cache(maxsize=4096)
+def extract_file_extension(file_path: str) -> str:
+    return os.path.splitext(file_path)[1].lower()
+
+
+def extract_code_snippet(content: str, line_count: int, max_lines: int = 30) -> str:
+    """First ``max_lines`` lines, located by newline walking.
+
+    No line list is materialized; find() walks to the cutoff and one
+    slice takes the prefix.
+    """
+    if line_count <= max_lines:
+        return content
+    cutoff = -1
+    for _ in range(max_lines):
+        cutoff = content.find("\n", cutoff + 1)
+        if cutoff == -1:
+            return content
+    return content[:cutoff]
+
+
+def create_implementation_content(
+    change_type: str,
+    file_path: str,
+    description: str,
+    component: str,
+    content_changed: str,
+    extension: str,
+    line_count: int,
+) -> str:
+    snippet = extract_code_snippet(content_changed, line_count)
+    # Collected parts and one join: repeated += re-copies the whole
+    # accumulated buffer per append.
+    parts = [f"{change_type.capitalize()} {file_path}\n\n"]
+    if description:
+        parts.append(f"Purpose: {description}\n\n")
+    parts.append(f"Component: {component}\n")
+    parts.append(f"File: {file_path}:1-{line_count}\n\n")
+    if snippet:
+        parts.append(f"Implementation:\n```{extension.lstrip('.')}\n{snippet}\n```\n")
+    return "".join(parts)
+
+
+def main() -> int:
+    payload = json.load(sys.stdin)
+    tool_name = payload.get("tool_name", "")
+    tool_input = payload.get("tool_input", {})
+    file_path = tool_input.get("file_path", "")
+    content_changed = tool_input.get("content") or tool_input.get("new_string") or ""
+    if not file_path or not content_changed or should_skip(file_path):
+        return 0
+
+    # Past the filter: only real code edits pay the memory-stack import.
+    from core.memory import MemoryShard, get_batched_store
+
+    change_type = "created" if tool_name == "Write" else "modified"
+    component = extract_component_from_path(file_path)
+    extension = extract_file_extension(file_path)
+
+    if os.getenv("BMAD_HOOK_VERBOSE"):
+        sys.stderr.write(_BANNER)
+
+    # One scan each: the byte encoding feeds the digest and the newline
+    # count feeds the content builder, instead of re-encoding and
+    # re-splitting the (possibly whole-file) payload downstream.
+    content_bytes = content_changed.encode("utf-8", "surrogatepass")
+    line_count = content_changed.count("\n") + 1
+
+    try:
+        content = create_implementation_content(
+            change_type,
+            file_path,
+            tool_input.get("description", ""),
+            component,
+            content_changed,
+            extension,
+            line_count,
+        )
+        digest = _hash64(content_bytes)
+        now_iso = datetime.now().isoformat()
+        shard = MemoryShard.model_construct(
+            unique_id=f"impl-{component}-{digest}",
+            content=content,
+            type="implementation",
+            agent=os.getenv("BMAD_AGENT", "dev"),
+            group_id=os.getenv("BMAD_GROUP_ID", "default"),
+            component=component,
+            created_at=now_iso,
+            tags=["implementation", component],
+        )
+        # Buffered: shards batch up and flush as one upsert at the size
+        # threshold or process exit, not one round-trip per edit.
+        get_batched_store().add(shard)
+        if os.getenv("BMAD_HOOK_VERBOSE"):
+            sys.stderr.write(
+                f"Queued implementation memory for {file_path}\n"
+                f"  id: {shard.unique_id}\n"
+                f"  at: {now_iso}\n"
+            )
+    except Exception as exc:
+        if os.getenv("BMAD_DEBUG"):
+            import traceback
+
+            traceback.print_exc(file=sys.stderr)
+        else:
+            sys.stderr.write(f"[implementation-storage] {type(exc).__name__}: {exc}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""PreToolUse hook: surface past error patterns when a command smells like debugging."""
+
+import functools
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(os.getenv("BMAD_ROOT", Path(__file__).resolve().parents[2])) / "src"))
+
+ERROR_KEYWORDS = (
+    "error",
+    "failed",
+    "failing",
+    "failure",
+    "exception",
+    "traceback",
+    "crash",
+    "broken",
+    "bug",
+    "fix",
+    "debug",
+    "issue",
+    "regression",
+    "timeout",
+    "segfault",
+    "flaky",
+)
+
+# Whole-word matching: tokenize once, then the keyword check is a set
+# intersection. This also stops substring false positives like "prefix"
+# triggering on "fix", which every substring-based variant of this check
+# suffered from.
+_ERROR_KEYWORDS_SET = frozenset(ERROR_KEYWORDS)
+_WORD_RE = re.compile(r"\w+")
+
+# The test-failure patterns fold into one alternation so the second check
+# is also a single pass.
+_TEST_RE = re.compile(
+    r"test_\w+\s+FAILED"
+    r"|\d+\s+failed"
+    r"|assert(?:ion)?\s*error"
+    r"|expected\s+.+\s+but\s+got",
+    re.IGNORECASE,
+)
+
+
+def detect_error_context(command: str, description: str, file_path: str):
+    """(is_error_context, matched keyword) for a tool invocation."""
+    text = f"{command} {description} {file_path}".lower()
+    hit = set(_WORD_RE.findall(text)) & _ERROR_KEYWORDS_SET
+    if hit:
+        return True, min(hit)
+    if _TEST_RE.search(text):
+        return True, "test-failure"
+    return False, ""
+
+
+@functools.lru_cache(maxsize=4096)
+def _component_from_path(file_path: str) -> str:
+    parts = file_path.replace("\\", "/").split("/")
+    for marker in ("src", "tests", "test", "scripts"):
+        if marker in parts:
+            index = parts.index(marker)
+            if index + 1 < len(parts):
+                return parts[index + 1]
+    return os.path.basename(os.path.dirname(file_path)) or "general"
+
+
+def extract_error_query(command: str, file_path: str, keyword: str) -> str:
+    component = _component_from_path(file_path) if file_path else "general"
+    return f"{component} {keyword} error pattern fix"
+
+
+def main() -> int:
+    payload = json.load(sys.stdin)
+    tool_input = payload.get("tool_input", {})
+    command = tool_input.get("command", "")
+    description = tool_input.get("description", "")
+    file_path = tool_input.get("file_path", "")
+
+    is_error, keyword = detect_error_context(command, description, file_path)
+    if not is_error:
+        return 0
+
+    from core.memory import search_memories
+
+    try:
+        results = search_memories(
+            extract_error_query(command, file_path, keyword),
+            group_id=os.getenv("BMAD_GROUP_ID"),
+            memory_types=["error-pattern"],
+            limit=3,
+            score_threshold=0.6,
+        )
+    except Exception:
+        return 0  # never block the tool on memory errors
+
+    if not results:
+        return 0
+    parts = ["[issue-context] similar past errors:\n"]
+    parts.extend(f"  - {result.content}\n" for result in results)
+    sys.stderr.write("".join(parts))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
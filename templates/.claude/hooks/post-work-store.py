@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Post-work storage CLI: persist what an agent built after a story step.
+
+Invoked by workflow hooks with the built/tested summaries; validates that
+summaries carry concrete file:line references before storing them as
+memory shards.
+"""
+
+import argparse
+import os
+import re
+import secrets
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(os.getenv("BMAD_ROOT", Path(__file__).resolve().parents[2])) / "src"))
+
+from core.memory import MemoryShard, flush_memory, store_batch  # noqa: E402
+from core.memory.memory_store import warm_memory  # noqa: E402
+
+# Compiled once at import; validate_file_references runs twice per
+# invocation and only needs the first match, not a findall list.
+_FILE_LINE_RE = re.compile(
+    r"[a-zA-Z0-9_/\-.]+\.(?:py|md|yaml|yml|sql|sh|js|ts|tsx|json):\d+(?:-\d+)?"
+)
+
+
+def validate_file_references(content: str) -> tuple[bool, str]:
+    """Check that content cites at least one concrete file:line reference."""
+    if _FILE_LINE_RE.search(content) is None:
+        return False, "no file:line references found — cite concrete locations"
+    return True, ""
+
+
+def main() -> int:
+    # Overlap the model cold start with argument parsing.
+    warmer = threading.Thread(target=warm_memory, daemon=True)
+    warmer.start()
+
+    parser = argparse.ArgumentParser(description="Store post-work memory shards")
+    parser.add_argument("--agent", required=True)
+    parser.add_argument("--group-id", required=True)
+    parser.add_argument("--story-id", required=True)
+    parser.add_argument("--epic-id", default="")
+    parser.add_argument("--what-built", required=True)
+    parser.add_argument("--testing", default="")
+    parser.add_argument("--decision", action="append", default=[])
+    args = parser.parse_args()
+
+    for label, content in (("what-built", args.what_built), ("testing", args.testing)):
+        if content:
+            ok, reason = validate_file_references(content)
+            if not ok:
+                print(f"[post-work-store] {label}: {reason}", file=sys.stderr)
+
+    iso = datetime.now().isoformat()
+    shards = [
+        MemoryShard.model_construct(
+            unique_id=f"story-{args.story_id}-built-{secrets.token_hex(4)}",
+            content=args.what_built,
+            type="implementation",
+            agent=args.agent,
+            group_id=args.group_id,
+            importance="high",
+            story_id=args.story_id,
+            epic_id=args.epic_id or None,
+            created_at=iso,
+            tags=["post-work", args.story_id],
+        )
+    ]
+    if args.testing:
+        shards.append(
+            MemoryShard.model_construct(
+                unique_id=f"story-{args.story_id}-testing-{secrets.token_hex(4)}",
+                content=args.testing,
+                type="implementation",
+                agent=args.agent,
+                group_id=args.group_id,
+                story_id=args.story_id,
+                epic_id=args.epic_id or None,
+                created_at=iso,
+                tags=["testing", args.story_id],
+            )
+        )
+    for index, decision in enumerate(args.decision):
+        shards.append(
+            MemoryShard.model_construct(
+                unique_id=f"story-{args.story_id}-decision-{index}-{secrets.token_hex(4)}",
+                content=decision,
+                type="architecture-decision",
+                agent=args.agent,
+                group_id=args.group_id,
+                story_id=args.story_id,
+                epic_id=args.epic_id or None,
+                created_at=iso,
+                tags=["decision", args.story_id],
+            )
+        )
+
+    warmer.join()
+    stored = store_batch(shards)
+    flush_memory()
+    print(f"[post-work-store] stored {stored} shard(s)", file=sys.stderr)
+    return 0 if stored else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""PreCompact hook: distill the session transcript into a memory shard."""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(os.getenv("BMAD_ROOT", Path(__file__).resolve().parents[2])) / "src"))
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# The file, decision, and completion patterns are fused into a single
+# alternation with named capture groups: the multi-MB transcript is
+# traversed once, with each match dispatched by m.lastgroup, instead of
+# once per pattern. Error extraction keeps its own pass because it needs
+# the trailing-lines context window.
+_UNIFIED = re.compile(
+    r"(?:modified|created|updated|wrote|edited)\s+`?(?P<file>[\w./\-]+\.\w+)`?"
+    r"|file_path['\"]?\s*[:=]\s*['\"](?P<filekv>[^'\"]+)['\"]"
+    r"|(?:decided|chose|opted)\s+to\s+(?P<decision>[^.\n]{10,120})"
+    r"|(?:going|agreed)\s+with\s+(?P<decision2>[^.\n]{10,120})"
+    r"|(?:completed|finished|implemented|fixed|resolved)\s+(?P<accomp>[^.\n]{10,120})"
+    r"|(?P<accomp2>(?:all|\d+)\s+tests?\s+pass(?:ing|ed)?[^.\n]{0,80})",
+    re.IGNORECASE,
+)
+
+# lastgroup -> which collector the captured text belongs to.
+_GROUP_KIND = {
+    "file": "files",
+    "filekv": "files",
+    "decision": "decisions",
+    "decision2": "decisions",
+    "accomp": "accomplishments",
+    "accomp2": "accomplishments",
+}
+
+_ERROR_LINE_KEYWORDS = ("error:", "failed:", "exception:", "traceback")
+_SOLUTION_KEYWORDS = ("fixed", "resolved", "solution", "instead", "workaround")
+
+try:
+    import ahocorasick
+
+    _ERR_AHO = ahocorasick.Automaton()
+    for _kw in _ERROR_LINE_KEYWORDS:
+        _ERR_AHO.add_word(_kw, _kw)
+    _ERR_AHO.make_automaton()
+except ImportError:
+    _ERR_AHO = None
+
+_ERR_FALLBACK_RE = re.compile("|".join(map(re.escape, _ERROR_LINE_KEYWORDS)))
+_SOLUTION_RE = re.compile("|".join(map(re.escape, _SOLUTION_KEYWORDS)))
+
+
+def _iter_error_positions(lowered: str):
+    if _ERR_AHO is not None:
+        for end, keyword in _ERR_AHO.iter(lowered):
+            yield end - len(keyword) + 1
+    else:
+        for match in _ERR_FALLBACK_RE.finditer(lowered):
+            yield match.start()
+
+
+def iter_messages(transcript_path: str):
+    """Yield message content strings from the JSONL transcript lazily.
+
+    Streaming bounds peak memory to one message instead of the whole
+    multi-MB transcript, and skips building the joined conversation
+    string entirely.
+    """
+    try:
+        # Binary read: orjson parses bytes directly, skipping the decode
+        # to str for lines whose content is never extracted.
+        with open(transcript_path, "rb") as handle:
+            for line in handle:
+                try:
+                    content = _loads(line).get("content", "")
+                except (ValueError, AttributeError):
+                    continue
+                if content:
+                    yield content
+    except OSError:
+        return
+
+
+def extract_errors_encountered(text: str, limit: int = 5) -> list[str]:
+    """Error lines with up to five following lines of resolution context.
+
+    One lowered copy and one automaton (or alternation) pass locate the
+    error indicators; only the matched lines and their bounded follower
+    windows are materialized.
+    """
+    lowered = text.lower()
+    errors = []
+    last_line_end = -1
+    for pos in _iter_error_positions(lowered):
+        if pos <= last_line_end:
+            continue  # further hit on an already-captured line
+        line_start = text.rfind("\n", 0, pos) + 1
+        line_end = text.find("\n", pos)
+        if line_end == -1:
+            line_end = len(text)
+        context = [text[line_start:line_end].strip()]
+        # Walk the next five lines by newline positions; no list of the
+        # remaining text is ever built, and the lowered copy doubles as
+        # the case-folded view for the solution search.
+        follower_start = line_end + 1
+        for _ in range(5):
+            if follower_start >= len(text):
+                break
+            follower_end = text.find("\n", follower_start)
+            if follower_end == -1:
+                follower_end = len(text)
+            if _SOLUTION_RE.search(lowered, follower_start, follower_end):
+                context.append(text[follower_start:follower_end].strip())
+            follower_start = follower_end + 1
+        errors.append(" | ".join(context))
+        last_line_end = line_end
+        if len(errors) >= limit:
+            break
+    return errors
+
+
+# (cap, minimum stripped length) per collector.
+_COLLECT_LIMITS = {"files": (10, 1), "decisions": (5, 21), "accomplishments": (5, 11)}
+
+# Scan budget: the first 512KB of content plus a rolling 512KB tail. The
+# summary keeps only a handful of items per category and the
+# highest-signal material sits near the session start and end, so a
+# 50MB transcript costs the same bounded scan as a 1MB one — PreCompact
+# blocks the compaction UX, so this is a latency cap.
+_HEAD_BYTES = 512 * 1024
+_TAIL_BYTES = 512 * 1024
+
+
+def create_session_summary(message_iter) -> str:
+    from collections import deque
+
+    # Insertion-ordered dicts dedupe as matches stream in, strip once per
+    # match, and stop collecting a category at its cap instead of hoarding
+    # every match and discarding most of them afterwards.
+    collected = {"files": {}, "decisions": {}, "accomplishments": {}}
+    errors: list[str] = []
+    saw_content = False
+
+    def full() -> bool:
+        return (
+            all(len(collected[kind]) >= cap for kind, (cap, _) in _COLLECT_LIMITS.items())
+            and len(errors) >= 5
+        )
+
+    def consume(text: str) -> None:
+        for match in _UNIFIED.finditer(text):
+            group = match.lastgroup
+            if group is None:
+                continue
+            kind = _GROUP_KIND[group]
+            cap, min_len = _COLLECT_LIMITS[kind]
+            bucket = collected[kind]
+            if len(bucket) >= cap:
+                continue
+            value = match.group(group).strip()
+            if len(value) >= min_len:
+                bucket.setdefault(value, None)
+        if len(errors) < 5:
+            errors.extend(extract_errors_encountered(text, 5 - len(errors)))
+
+    scanned = 0
+    tail: deque = deque()
+    tail_size = 0
+    for text in message_iter:
+        saw_content = True
+        if full():
+            break  # every collector is full; skip the remaining messages
+        if scanned < _HEAD_BYTES:
+            scanned += len(text)
+            consume(text)
+        else:
+            # Past the head budget: keep only a rolling tail to scan after
+            # the stream ends.
+            tail.append(text)
+            tail_size += len(text)
+            while tail_size > _TAIL_BYTES and len(tail) > 1:
+                tail_size -= len(tail.popleft())
+    for text in tail:
+        if full():
+            break
+        consume(text)
+    if not saw_content:
+        return ""
+
+    files = sorted(collected["files"])
+    decisions = list(collected["decisions"])
+    accomplishments = list(collected["accomplishments"])
+
+    parts = ["Session summary\n"]
+    if accomplishments:
+        parts.append("Accomplishments:\n" + "\n".join(f"- {a}" for a in accomplishments))
+    if decisions:
+        parts.append("Decisions:\n" + "\n".join(f"- {d}" for d in decisions))
+    if files:
+        parts.append("Files touched:\n" + "\n".join(f"- {f}" for f in files))
+    if errors:
+        parts.append("Errors encountered:\n" + "\n".join(f"- {e}" for e in errors))
+    return "\n\n".join(parts)
+
+
+# Summaries memoized on the transcript's identity: PreCompact can fire
+# repeatedly on a transcript that has not grown (retries, back-to-back
+# compactions), and (mtime_ns, size) in the cache name makes stale
+# entries unreachable without any invalidation pass.
+_SUMMARY_CACHE_DIR = Path.home() / ".cache" / "bmad-precompact"
+
+
+def _summary_cache_path(transcript_path: str, st: os.stat_result) -> Path:
+    name_hash = hashlib.blake2b(transcript_path.encode(), digest_size=8).hexdigest()
+    return _SUMMARY_CACHE_DIR / f"{name_hash}-{st.st_mtime_ns}-{st.st_size}.txt"
+
+
+def main() -> int:
+    payload = json.load(sys.stdin)
+    transcript_path = payload.get("transcript_path", "")
+    try:
+        st = os.stat(transcript_path) if transcript_path else None
+    except OSError:
+        st = None
+    if st is None:
+        return 0
+
+    cache_path = _summary_cache_path(transcript_path, st)
+    try:
+        summary = cache_path.read_text()
+    except OSError:
+        summary = create_session_summary(iter_messages(transcript_path))
+        try:
+            _SUMMARY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(summary)
+        except OSError:
+            pass  # cache is best-effort
+    if not summary:
+        return 0
+
+    from core.memory import MemoryShard, get_batched_store
+    from core.memory.hashing import fast_short_hash
+
+    group_id = os.getenv("BMAD_GROUP_ID", "default")
+    try:
+        shard = MemoryShard.model_construct(
+            unique_id=f"session-{group_id}-{fast_short_hash(summary)}",
+            content=summary,
+            type="session-summary",
+            agent=os.getenv("BMAD_AGENT", "dev"),
+            group_id=group_id,
+            created_at=datetime.now().isoformat(),
+            tags=["precompact", group_id],
+        )
+        store = get_batched_store()
+        store.add(shard)
+        # The summary must be durable before compaction proceeds.
+        stored = store.flush()
+        if stored and os.getenv("BMAD_HOOK_VERBOSE"):
+            sys.stderr.write(f"[precompact-save] stored {shard.unique_id}\n")
+    except Exception as exc:
+        if os.getenv("BMAD_DEBUG"):
+            import traceback
+
+            traceback.print_exc(file=sys.stderr)
+        else:
+            sys.stderr.write(f"[precompact-save] {type(exc).__name__}: {exc}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
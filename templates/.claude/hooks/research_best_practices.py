@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""SubagentStop hook: harvest best practices from research-agent output."""
+
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(os.getenv("BMAD_ROOT", Path(__file__).resolve().parents[2])) / "src"))
+
+from _research_common import (
+    categorize_best_practice,
+    extract_best_practices,
+    is_research_agent,
+    truncate_practice,
+)
+
+
+def main() -> int:
+    data = json.load(sys.stdin)
+    # Check the small fields first: on the common non-research path the
+    # hook exits without ever binding the (possibly multi-MB) transcript.
+    agent_type = data.get("subagent_type") or data.get("agent_type", "")
+    task_description = data.get("task_description", "")
+    if not is_research_agent(agent_type, task_description):
+        return 0
+    result = data.get("transcript") or data.get("result", "")
+    if not result:
+        return 0
+
+    best_practices = extract_best_practices(result, limit=int(os.getenv("BP_MAX_PER_RUN", "20")))
+    if not best_practices:
+        sys.stderr.write("No best practices found in research output\n")
+        return 0
+
+    # Only a run that will actually store pays the memory-stack import
+    # (qdrant client, pydantic, numpy).
+    from core.memory import MemoryShard, generate_unique_id, store_batch
+
+    group_id = os.getenv("BMAD_GROUP_ID", "default")
+    agent = os.getenv("BMAD_AGENT", "dev")
+    shards = []
+    # Status lines buffer up and flush as one stderr write at the end,
+    # not one syscall per practice.
+    log = []
+    try:
+        for practice in best_practices:
+            truncated = truncate_practice(practice)
+            category = categorize_best_practice(truncated)
+            shards.append(
+                MemoryShard.model_construct(
+                    unique_id=generate_unique_id(truncated, prefix=f"bp-{category}"),
+                    content=truncated,
+                    type="best-practice",
+                    agent=agent,
+                    group_id=group_id,
+                    created_at=datetime.now().isoformat(),
+                    tags=["research", category],
+                )
+            )
+            log.append(f"Queued best practice ({category}): {truncated[:60]}...")
+        # One batched upsert instead of one round-trip per practice.
+        stored = store_batch(shards, collection_type="best-practices")
+        log.append(f"Stored {stored} best practices from research output")
+    except Exception as exc:
+        if os.getenv("BMAD_DEBUG"):
+            import traceback
+
+            traceback.print_exc(file=sys.stderr)
+        else:
+            log.append(f"[research-best-practices] {type(exc).__name__}: {exc}")
+    if log:
+        sys.stderr.write("\n".join(log) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""SubagentStop hook: harvest best practices from research-agent output.
+
+v2 of research_best_practices: adds content hashing for stable shard ids
+and a semantic-similarity dedup check before storing.
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(os.getenv("BMAD_ROOT", Path(__file__).resolve().parents[2])) / "src"))
+
+from _research_common import (
+    categorize_best_practice,
+    extract_best_practices,
+    is_research_agent,
+    truncate_practice,
+)
+
+DUPLICATE_SCORE = 0.8
+
+
+def duplicate_flags(candidates: list[str]) -> list[bool]:
+    """Per-candidate "already stored" flags from one batched lookup.
+
+    All candidates share a single embedding pass and one query_batch
+    round-trip instead of a full vector search per practice.
+    """
+    from core.memory import search_memories_batch
+
+    try:
+        result_lists = search_memories_batch(
+            candidates,
+            collection_types=["best-practices"] * len(candidates),
+            limit=1,
+            score_threshold=DUPLICATE_SCORE,
+        )
+    except Exception:
+        return [False] * len(candidates)  # storing a duplicate beats dropping a finding
+    return [bool(results) for results in result_lists]
+
+
+def main() -> int:
+    data = json.load(sys.stdin)
+    # Check the small fields first: on the common non-research path the
+    # hook exits without ever binding the (possibly multi-MB) transcript.
+    agent_type = data.get("subagent_type") or data.get("agent_type", "")
+    task_description = data.get("task_description", "")
+    if not is_research_agent(agent_type, task_description):
+        return 0
+    result = data.get("transcript") or data.get("result", "")
+    if not result:
+        return 0
+
+    best_practices = extract_best_practices(result, limit=int(os.getenv("BP_MAX_PER_RUN", "20")))
+    if not best_practices:
+        sys.stderr.write("No best practices found in research output\n")
+        return 0
+
+    # Only a run that will actually store pays the memory-stack import
+    # (qdrant client, pydantic, numpy).
+    from core.memory import MemoryShard, store_batch
+    from core.memory.hashing import fast_short_hash
+
+    group_id = os.getenv("BMAD_GROUP_ID", "default")
+    agent = os.getenv("BMAD_AGENT", "dev")
+    truncated_practices = [truncate_practice(practice) for practice in best_practices]
+    # Hash every candidate up front: the digest doubles as the dedup-memo
+    # key and the shard-id suffix, and repeated boilerplate ("avoid X"
+    # showing up in several findings) collapses to one lookup and one
+    # store instead of one per occurrence. fast_short_hash (xxh3 when
+    # available) is plenty for a 16-hex dedup key and much cheaper than
+    # running SHA-256 per practice.
+    hashes = [fast_short_hash(text, n=16) for text in truncated_practices]
+    unique: dict[str, str] = {}
+    for digest, text in zip(hashes, truncated_practices):
+        unique.setdefault(digest, text)
+    dup_by_hash = dict(zip(unique, duplicate_flags(list(unique.values()))))
+    shards = []
+    skipped = 0
+    # Status lines buffer up and flush as one stderr write at the end,
+    # not one syscall per practice.
+    log = []
+    try:
+        queued: set[str] = set()
+        for truncated, digest in zip(truncated_practices, hashes):
+            if dup_by_hash[digest] or digest in queued:
+                skipped += 1
+                continue
+            queued.add(digest)
+            category = categorize_best_practice(truncated)
+            shards.append(
+                MemoryShard.model_construct(
+                    unique_id=f"bp-{category}-{digest}",
+                    content=truncated,
+                    type="best-practice",
+                    agent=agent,
+                    group_id=group_id,
+                    created_at=datetime.now().isoformat(),
+                    tags=["research", category],
+                )
+            )
+            log.append(f"Queued best practice ({category}): {truncated[:60]}...")
+        # One batched upsert instead of one round-trip per practice.
+        stored = store_batch(shards, collection_type="best-practices")
+        log.append(f"Stored {stored} best practices ({skipped} duplicates skipped)")
+    except Exception as exc:
+        if os.getenv("BMAD_DEBUG"):
+            import traceback
+
+            traceback.print_exc(file=sys.stderr)
+        else:
+            log.append(f"[research-best-practices-v2] {type(exc).__name__}: {exc}")
+    if log:
+        sys.stderr.write("\n".join(log) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Search the shared best-practices collection from the command line."""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(os.getenv("BMAD_ROOT", Path(__file__).resolve().parents[2])) / "src"))
+
+from core.memory import search_memories  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Search best practices")
+    parser.add_argument("--query", required=True)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--min-score", type=float, default=0.0)
+    args = parser.parse_args()
+
+    try:
+        # The score floor runs server-side so below-threshold hits are
+        # never serialized; over-fetch by 50% in case the floor thins the
+        # top-k, then trim locally.
+        results = search_memories(
+            args.query,
+            collection_type="best-practices",
+            limit=(args.limit * 3 + 1) // 2,
+            score_threshold=args.min_score,
+        )
+        filtered = results[: args.limit]
+        # Build the report once and write it once; a print per line costs
+        # a syscall each on line-buffered stdout.
+        body = "".join(
+            f"\n{index}. [Score: {result.score:.2f}]\n{result.content}\n"
+            for index, result in enumerate(filtered, 1)
+        )
+        sys.stdout.write(f"Found {len(filtered)} best practice(s) for: {args.query}\n{body}")
+        sys.stdout.flush()
+        return 0
+    except Exception as exc:
+        if os.getenv("BMAD_DEBUG"):
+            import traceback
+
+            traceback.print_exc(file=sys.stderr)
+        else:
+            sys.stderr.write(f"[search-best-practices] {type(exc).__name__}: {exc}\n")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
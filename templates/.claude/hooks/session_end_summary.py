@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""SessionEnd hook: store a comprehensive summary of the session."""
+
+import functools
+import json
+import os
+import re
+import sys
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(os.getenv("BMAD_ROOT", Path(__file__).resolve().parents[2])) / "src"))
+
+# Streaming parse: counts and strings are picked out of the raw stdin
+# bytes at parse time, skipping the json.loads -> json.dumps round trip
+# that re-materializes the whole session as a second full-size string.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Scope keyword groups as frozensets: tokenize the lowered text once,
+# then every group check is cheap set intersection — one linear pass
+# plus hashing, versus running a 28-branch alternation (or 28 substring
+# scans) over a megabyte of serialized session.
+_TOKEN_RE = re.compile(r"[a-z]+")
+
+_SCOPE_KEYWORDS = {
+    "implementation": frozenset(("implement", "code", "function", "class")),
+    "testing": frozenset(("test", "pytest", "assertion", "coverage")),
+    "debugging": frozenset(("debug", "error", "exception", "traceback")),
+    "documentation": frozenset(("document", "readme", "docstring", "changelog")),
+    "refactoring": frozenset(("refactor", "cleanup", "rename", "restructure")),
+    "configuration": frozenset(("config", "settings", "environment", "setup")),
+    "research": frozenset(("research", "investigate", "explore", "compare")),
+}
+
+
+@functools.lru_cache(maxsize=4)
+def analyze_session_scope(lowered: str) -> tuple[str, ...]:
+    """Which kinds of work the session touched, in a fixed order.
+
+    Memoized: the storage-log section re-asks for the scope of the same
+    text, and the cache turns that second call into a dict hit.
+    """
+    tokens = set(_TOKEN_RE.findall(lowered))
+    return tuple(
+        scope for scope, keywords in _SCOPE_KEYWORDS.items() if not keywords.isdisjoint(tokens)
+    )
+
+
+# File-path pattern with the dot excluded from the body class. The old
+# [a-zA-Z0-9_/\-\.]+ body overlapped with the literal dot that follows,
+# so timestamps and URLs in the serialized JSON fed quadratic
+# backtracking; with disjoint pieces the scan is effectively linear.
+_FILE_RE = re.compile(r"[A-Za-z0-9_/\-]+(?:\.[A-Za-z0-9_\-]+)*\.[a-z]{2,4}\b")
+
+_TOOL_RE = re.compile(r'"tool_name":\s*"(\w+)"')
+
+# Every remaining pattern compiled once at import: the per-call re.*
+# forms paid an re._compile cache lookup on each invocation.
+_ERROR_RE = re.compile(r"\b(?:error|exception|failed)\b")
+_TESTS_PASS_RE = re.compile(r"(?:all|\d+) tests? pass")
+_BUILD_OK_RE = re.compile(r"build (?:succeeded|passed|ok)")
+_UNCOMMITTED_RE = re.compile(r"(?:uncommitted|unstaged|not staged)")
+_BLOCKED_RE = re.compile(r"(?:blocked|waiting) on")
+_NEXT_STEP_RES = (
+    re.compile(r"(?:next step|todo|remaining)[:\s]+([^\n.]{10,150})", re.IGNORECASE),
+    re.compile(r"(?:need to|should)\s+([^\n.]{10,150})", re.IGNORECASE),
+)
+
+
+def _stream_session(raw: bytes):
+    """(tool_counts, session_text) from one streaming pass over the payload.
+
+    tool_name values are counted as parse events arrive and only the
+    string values are joined for the text scans, so no serialized copy
+    of the full session dict is ever built.
+    """
+    tool_counts = Counter()
+    chunks = []
+    for prefix, event, value in ijson.parse(raw):
+        if event == "string":
+            if prefix.endswith(".tool_name") or prefix == "tool_name":
+                tool_counts[value] += 1
+            chunks.append(value)
+    return tool_counts, "\n".join(chunks)
+
+
+def extract_session_metrics(session_text: str, lowered: str, tool_counts=None) -> dict:
+    if tool_counts is None:
+        # Serialized-path fallback: recover tool names from the JSON
+        # text, feeding Counter straight from the match iterator so no
+        # intermediate list of every tool use is built.
+        tool_counts = Counter(m.group(1) for m in _TOOL_RE.finditer(session_text))
+    files = _FILE_RE.findall(session_text)
+    error_count = sum(1 for _ in _ERROR_RE.finditer(lowered))
+    return {
+        "tool_counts": tool_counts,
+        "files_touched": sorted(set(files))[:15],
+        "error_count": error_count,
+    }
+
+
+def extract_final_state(lowered: str) -> list[str]:
+    state = []
+    if _TESTS_PASS_RE.search(lowered):
+        state.append("tests passing")
+    if _BUILD_OK_RE.search(lowered):
+        state.append("build green")
+    if _UNCOMMITTED_RE.search(lowered):
+        state.append("uncommitted changes remain")
+    if _BLOCKED_RE.search(lowered):
+        state.append("blocked on external input")
+    return state
+
+
+def extract_next_steps(session_text: str) -> list[str]:
+    # Insertion-ordered dict instead of set(): dedupes while keeping the
+    # top five deterministic, strips once per match, and stops scanning
+    # as soon as five unique steps are found.
+    seen: dict[str, None] = {}
+    for pattern in _NEXT_STEP_RES:
+        for match in pattern.finditer(session_text):
+            step = match.group(1).strip()
+            if len(step) > 15 and step not in seen:
+                seen[step] = None
+                if len(seen) >= 5:
+                    return list(seen)
+    return list(seen)
+
+
+def create_comprehensive_summary(session_text: str, tool_counts=None) -> str:
+    # Lower exactly once; every helper reads these buffers instead of
+    # re-lowering per call.
+    lowered = session_text.lower()
+
+    scopes = analyze_session_scope(lowered)
+    metrics = extract_session_metrics(session_text, lowered, tool_counts)
+    final_state = extract_final_state(lowered)
+    next_steps = extract_next_steps(session_text)
+
+    parts = ["Session summary\n"]
+    if scopes:
+        parts.append("Scope: " + ", ".join(scopes))
+    if metrics["tool_counts"]:
+        top_tools = ", ".join(
+            f"{name} x{count}" for name, count in metrics["tool_counts"].most_common(5)
+        )
+        parts.append(f"Tools: {top_tools}")
+    if metrics["files_touched"]:
+        parts.append("Files: " + ", ".join(metrics["files_touched"]))
+    if metrics["error_count"]:
+        parts.append(f"Errors mentioned: {metrics['error_count']}")
+    if final_state:
+        parts.append("Final state: " + "; ".join(final_state))
+    if next_steps:
+        parts.append("Next steps:\n" + "\n".join(f"- {step}" for step in next_steps))
+    # The storage log re-asks for the scope when tagging; the memoized
+    # analyzer makes the second call a dict hit.
+    parts.append("Tags: " + (", ".join(analyze_session_scope(lowered)) or "general"))
+    return "\n\n".join(parts)
+
+
+def main() -> int:
+    raw = sys.stdin.buffer.read()
+    if not raw.strip():
+        return 0
+    if ijson is not None:
+        tool_counts, session_text = _stream_session(raw)
+    else:
+        session_data = json.loads(raw)
+        if not session_data:
+            return 0
+        tool_counts = None
+        session_text = json.dumps(session_data)
+    if not session_text and not tool_counts:
+        return 0
+
+    summary = create_comprehensive_summary(session_text, tool_counts)
+
+    # Past the empty-payload gates: import the memory stack only when a
+    # summary will actually be stored.
+    from core.memory import MemoryShard, generate_unique_id, store_memory
+
+    group_id = os.getenv("BMAD_GROUP_ID", "default")
+    # Status lines buffer up and flush as one stderr write at the end.
+    log = ["Creating session summary..."]
+    try:
+        shard = MemoryShard.model_construct(
+            unique_id=generate_unique_id(summary, prefix=f"session-{group_id}"),
+            content=summary,
+            type="session-summary",
+            agent=os.getenv("BMAD_AGENT", "dev"),
+            group_id=group_id,
+            created_at=datetime.now().isoformat(),
+            tags=["session-end", group_id],
+        )
+        if store_memory(shard, collection_type="memory"):
+            log.append(f"Stored session summary {shard.unique_id}")
+        else:
+            log.append("Session summary was not stored")
+    except Exception as exc:
+        if os.getenv("BMAD_DEBUG"):
+            import traceback
+
+            traceback.print_exc(file=sys.stderr)
+        else:
+            log.append(f"[session-end-summary] {type(exc).__name__}: {exc}")
+    sys.stderr.write("\n".join(log) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Store a best practice into the shared best-practices collection."""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(os.getenv("BMAD_ROOT", Path(__file__).resolve().parents[2])) / "src"))
+
+from core.memory import MemoryShard, store_memory  # noqa: E402
+from core.memory.hashing import day_stamp, fast_short_hash  # noqa: E402
+
+
+def generate_unique_id(category: str, content: str) -> str:
+    return f"bp-{category}-{day_stamp()}-{fast_short_hash(content)}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Store a best practice")
+    parser.add_argument("--category", required=True)
+    parser.add_argument("--content", help="practice text; reads stdin when omitted")
+    parser.add_argument("--agent", default="dev")
+    parser.add_argument("--group-id", default="global")
+    parser.add_argument("--importance", default="medium")
+    args = parser.parse_args()
+
+    content = args.content if args.content is not None else sys.stdin.read()
+    if not content.strip():
+        print("[store-best-practices] empty content, nothing stored", file=sys.stderr)
+        return 1
+
+    try:
+        shard = MemoryShard.model_construct(
+            unique_id=generate_unique_id(args.category, content),
+            content=content,
+            type="best-practice",
+            agent=args.agent,
+            group_id=args.group_id,
+            importance=args.importance,
+            component=args.category,
+            created_at=datetime.now().isoformat(),
+            tags=["best-practice", args.category],
+        )
+        stored = store_memory(shard, collection_type="best-practices")
+        if os.getenv("BMAD_HOOK_VERBOSE"):
+            sys.stderr.write(f"[store-best-practices] stored {shard.unique_id}\n")
+        return 0 if stored else 1
+    except Exception as exc:
+        if os.getenv("BMAD_DEBUG"):
+            import traceback
+
+            traceback.print_exc(file=sys.stderr)
+        else:
+            sys.stderr.write(f"[store-best-practices] {type(exc).__name__}: {exc}\n")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Store a chat/session summary shard into the project memory collection."""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(os.getenv("BMAD_ROOT", Path(__file__).resolve().parents[2])) / "src"))
+
+from core.memory import MemoryShard, store_memory  # noqa: E402
+from core.memory.hashing import day_stamp, fast_short_hash  # noqa: E402
+
+
+def generate_unique_id(group_id: str, content: str) -> str:
+    return f"chat-{group_id}-{day_stamp()}-{fast_short_hash(content)}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Store a chat memory shard")
+    parser.add_argument("--group-id", required=True)
+    parser.add_argument("--agent", default="dev")
+    parser.add_argument("--content", help="summary text; reads stdin when omitted")
+    parser.add_argument("--story-id", default=None)
+    args = parser.parse_args()
+
+    content = args.content if args.content is not None else sys.stdin.read()
+    if not content.strip():
+        print("[store-chat-memory] empty content, nothing stored", file=sys.stderr)
+        return 1
+
+    try:
+        shard = MemoryShard.model_construct(
+            unique_id=generate_unique_id(args.group_id, content),
+            content=content,
+            type="session-summary",
+            agent=args.agent,
+            group_id=args.group_id,
+            story_id=args.story_id,
+            created_at=datetime.now().isoformat(),
+            tags=["chat", args.group_id],
+        )
+        stored = store_memory(shard)
+        if os.getenv("BMAD_HOOK_VERBOSE"):
+            sys.stderr.write(f"[store-chat-memory] stored {shard.unique_id}\n")
+        return 0 if stored else 1
+    except Exception as exc:
+        if os.getenv("BMAD_DEBUG"):
+            import traceback
+
+            traceback.print_exc(file=sys.stderr)
+        else:
+            sys.stderr.write(f"[store-chat-memory] {type(exc).__name__}: {exc}\n")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
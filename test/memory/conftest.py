@@ -0,0 +1,13 @@
+"""Path setup for the Python memory-layer tests.
+
+Mirrors what the hook scripts do at runtime: `src` on sys.path for
+`core.memory`, and the hooks directory itself so the shared hook modules
+import by name.
+"""
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+sys.path.insert(0, str(REPO_ROOT / "templates" / ".claude" / "hooks"))
@@ -0,0 +1,77 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core.memory.embed_cache import QueryEmbeddingCache
+
+
+def _unit_vector(seed: int, dim: int = 384) -> "np.ndarray":
+    rng = np.random.default_rng(seed)
+    vector = rng.standard_normal(dim).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_quantize_roundtrip_is_tight():
+    vector = _unit_vector(0)
+    quantized, scale = QueryEmbeddingCache._quantize(vector)
+    restored = quantized.astype(np.float32) * scale
+    # Max quantization error is half a step of the int8 grid.
+    assert np.max(np.abs(restored - vector)) <= scale / 2 + 1e-7
+
+
+def test_self_similarity_is_about_one():
+    # Regression test for the int16 accumulator overflow: a vector looked
+    # up against its own cached copy must score ~1.0, not a wrapped sum.
+    cache = QueryEmbeddingCache()
+    vector = _unit_vector(1)
+    cache.put(vector, key=("memory",), value=["hit"])
+    assert cache.get(vector, ("memory",)) == ["hit"]
+
+
+def test_dissimilar_vector_misses():
+    cache = QueryEmbeddingCache()
+    cache.put(_unit_vector(2), key=("memory",), value=["hit"])
+    # Independent random unit vectors are near-orthogonal in 384 dims.
+    assert cache.get(_unit_vector(3), ("memory",)) is None
+
+
+def test_key_mismatch_misses():
+    cache = QueryEmbeddingCache()
+    vector = _unit_vector(4)
+    cache.put(vector, key=("memory",), value=["hit"])
+    assert cache.get(vector, ("best-practices",)) is None
+
+
+def test_expired_entries_miss():
+    cache = QueryEmbeddingCache(ttl_seconds=-1.0)  # everything is already stale
+    vector = _unit_vector(5)
+    cache.put(vector, key=("memory",), value=["hit"])
+    assert cache.get(vector, ("memory",)) is None
+
+
+def test_invalidate_by_predicate():
+    cache = QueryEmbeddingCache()
+    kept = _unit_vector(6)
+    evicted = _unit_vector(7)
+    cache.put(kept, key=("memory",), value=["kept"])
+    cache.put(evicted, key=("best-practices",), value=["evicted"])
+    cache.invalidate(lambda key: key[0] == "best-practices")
+    assert cache.get(kept, ("memory",)) == ["kept"]
+    assert cache.get(evicted, ("best-practices",)) is None
+
+
+def test_clear_drops_everything():
+    cache = QueryEmbeddingCache()
+    vector = _unit_vector(8)
+    cache.put(vector, key=("memory",), value=["hit"])
+    cache.clear()
+    assert cache.get(vector, ("memory",)) is None
+
+
+def test_ring_eviction_recycles_oldest_slot():
+    cache = QueryEmbeddingCache(capacity=2)
+    first = _unit_vector(9)
+    cache.put(first, key=("memory",), value=["first"])
+    cache.put(_unit_vector(10), key=("memory",), value=["second"])
+    cache.put(_unit_vector(11), key=("memory",), value=["third"])
+    assert cache.get(first, ("memory",)) is None
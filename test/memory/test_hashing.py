@@ -0,0 +1,35 @@
+from core.memory.hashing import _MAX_HASH_BYTES, day_stamp, fast_short_hash
+
+
+def test_fast_short_hash_is_deterministic():
+    assert fast_short_hash("hello world") == fast_short_hash("hello world")
+    assert fast_short_hash("hello world") != fast_short_hash("hello_world")
+
+
+def test_fast_short_hash_length_and_charset():
+    for n in (12, 16):
+        digest = fast_short_hash("content", n=n)
+        assert len(digest) == n
+        assert all(c in "0123456789abcdef" for c in digest)
+
+
+def test_fast_short_hash_accepts_str_and_bytes():
+    assert fast_short_hash("abc") == fast_short_hash(b"abc")
+
+
+def test_fast_short_hash_caps_input_at_4kib():
+    # Documented behavior: only the first 4 KiB feed the digest.
+    base = "x" * _MAX_HASH_BYTES
+    assert fast_short_hash(base) == fast_short_hash(base + "tail")
+
+
+def test_day_stamp_formats():
+    default = day_stamp()
+    compact = day_stamp("%Y%m%d")
+    assert len(default) == 10 and default[4] == "-" and default[7] == "-"
+    assert len(compact) == 8 and compact.isdigit()
+    assert default.replace("-", "") == compact
+
+
+def test_day_stamp_is_cached_per_format():
+    assert day_stamp() is day_stamp()
@@ -0,0 +1,33 @@
+from precompact_save import extract_errors_encountered
+
+
+def test_error_line_with_solution_context():
+    text = (
+        "starting work\n"
+        "Error: connection refused\n"
+        "retrying once\n"
+        "fixed by restarting the service\n"
+        "moving on\n"
+    )
+    errors = extract_errors_encountered(text)
+    assert errors == ["Error: connection refused | fixed by restarting the service"]
+
+
+def test_error_line_without_solution():
+    errors = extract_errors_encountered("Exception: boom\nno remedy here\n")
+    assert errors == ["Exception: boom"]
+
+
+def test_same_line_matches_are_deduplicated():
+    # Two indicators on one line must yield one entry.
+    errors = extract_errors_encountered("Error: failed: everything at once\n")
+    assert len(errors) == 1
+
+
+def test_limit_is_respected():
+    text = "\n".join(f"Error: number {i}" for i in range(10))
+    assert len(extract_errors_encountered(text, limit=3)) == 3
+
+
+def test_no_errors_means_empty_list():
+    assert extract_errors_encountered("a perfectly calm transcript") == []
@@ -0,0 +1,55 @@
+from _research_common import (
+    categorize_best_practice,
+    extract_best_practices,
+    is_research_agent,
+    truncate_practice,
+)
+
+
+def test_extract_keeps_only_indicator_paragraphs():
+    content = (
+        "Some unrelated discussion about the weather.\n\n"
+        "The best practice here is to validate inputs\nat the boundary.\n\n"
+        "Another plain paragraph."
+    )
+    practices = extract_best_practices(content)
+    assert practices == ["The best practice here is to validate inputs at the boundary."]
+
+
+def test_extract_is_case_insensitive():
+    assert extract_best_practices("AVOID global mutable state.") == [
+        "AVOID global mutable state."
+    ]
+
+
+def test_extract_respects_limit():
+    content = "\n\n".join(f"guideline number {i}" for i in range(5))
+    assert len(extract_best_practices(content, limit=2)) == 2
+
+
+def test_categorize_matches_whole_words_only():
+    assert categorize_best_practice("Prefer idiomatic Python loops") == "python-best-practices"
+    # 'py' inside 'copy' and 'ts' inside 'points' must not categorize.
+    assert categorize_best_practice("copy the points happily") == "general-best-practices"
+
+
+def test_categorize_first_match_wins():
+    assert categorize_best_practice("docker beats manual deploys") == "devops-best-practices"
+
+
+def test_truncate_short_text_is_untouched():
+    assert truncate_practice("short") == "short"
+
+
+def test_truncate_cuts_on_a_word_boundary():
+    text = "word " * 400
+    truncated = truncate_practice(text, max_chars=100)
+    assert truncated.endswith("...")
+    assert len(truncated) <= 103
+    assert not truncated[:-3].endswith(" wor")  # no mid-word cut
+
+
+def test_is_research_agent():
+    assert is_research_agent("researcher", "")
+    assert is_research_agent("", "Investigate caching strategies")
+    assert not is_research_agent("dev", "implement the parser")
@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from core.memory.token_budget import (
+    AgentId,
+    DEFAULT_TOKEN_BUDGET,
+    count_tokens,
+    get_optimal_context,
+    get_token_budget,
+)
+
+
+def _result(content: str) -> SimpleNamespace:
+    return SimpleNamespace(content=content)
+
+
+def test_budget_by_name_and_id_agree():
+    for agent in AgentId:
+        assert get_token_budget(agent) == get_token_budget(agent.name)
+
+
+def test_unknown_agent_gets_default_budget():
+    assert get_token_budget("mystery-role") == DEFAULT_TOKEN_BUDGET
+
+
+def test_optimal_context_empty_input():
+    assert get_optimal_context([], 1000) == []
+
+
+def test_optimal_context_cutoff():
+    # Each result costs count_tokens(content); the cutoff keeps the
+    # highest-ranked prefix whose cumulative cost fits the budget.
+    results = [_result("x" * 40) for _ in range(4)]
+    per_result = count_tokens(results[0].content)
+    budget = per_result * 2 + per_result // 2  # room for exactly two
+    assert get_optimal_context(results, budget) == results[:2]
+
+
+def test_optimal_context_keeps_everything_under_budget():
+    results = [_result("short"), _result("also short")]
+    assert get_optimal_context(results, 10_000) == results
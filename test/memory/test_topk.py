@@ -0,0 +1,34 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core.memory.topk_numba import topk
+
+
+def test_topk_matches_full_sort():
+    rng = np.random.default_rng(0)
+    scores = rng.standard_normal(500).astype(np.float32)
+    values, ids = topk(scores, 10)
+    expected_ids = np.argsort(scores)[::-1][:10]
+    assert np.array_equal(ids, expected_ids)
+    assert np.array_equal(values, scores[expected_ids])
+
+
+def test_topk_values_are_descending():
+    rng = np.random.default_rng(1)
+    values, _ = topk(rng.standard_normal(100).astype(np.float32), 7)
+    assert np.all(np.diff(values) <= 0)
+
+
+def test_topk_clamps_k_to_input_size():
+    scores = np.asarray([0.3, 0.1, 0.2], dtype=np.float32)
+    values, ids = topk(scores, 10)
+    assert len(values) == len(ids) == 3
+    assert values[0] == pytest.approx(0.3)
+
+
+def test_topk_k_zero_and_empty_input():
+    values, ids = topk(np.asarray([1.0, 2.0], dtype=np.float32), 0)
+    assert len(values) == len(ids) == 0
+    values, ids = topk(np.empty(0, dtype=np.float32), 5)
+    assert len(values) == len(ids) == 0